@@ -1,12 +1,31 @@
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QPixmap, QImage
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtCore import Qt, QRect, QPoint
 
 import numpy as np
 import appSettings
 from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap, QImage
 from PyQt5.QtCore import Qt, QRect
 
+# Marker glyph (circle + cross) is pre-rendered once per group color
+_GLYPH_HALF = 14
+_GLYPH_SIZE = 2 * _GLYPH_HALF + 1
+
+
+def _make_marker_glyph(color):
+    """Render the marker glyph in the given color onto a transparent QPixmap."""
+    glyph = QPixmap(_GLYPH_SIZE, _GLYPH_SIZE)
+    glyph.fill(Qt.transparent)
+    painter = QPainter(glyph)
+    painter.setPen(QPen(color, 3))
+    c = _GLYPH_HALF
+    painter.drawEllipse(c-6, c-6, 12, 12)
+    painter.drawLine(c-12, c, c+12, c)
+    painter.drawLine(c, c-12, c, c+12)
+    painter.end()
+    return glyph
+
+
 class MarkerImageWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -27,17 +46,52 @@ class MarkerImageWidget(QWidget):
         self.setAttribute(Qt.WA_TransparentForMouseEvents, False)
         # Marker logic
         self.marker_groups = {}
+        # Cached src_rect and image->widget mapping (sx, sy, ox, oy);
+        # invalidated on image, zoom or size changes
+        self._src_rect = None
+        self._transform = None
+        # Line batch state (see begin_line_batch/end_line_batch)
+        self._batch_painter = None
+        self._batch_pen = None
+        self._batch_dirty = QRect()
 
     def set_image(self, qimage_or_pixmap):
         if isinstance(qimage_or_pixmap, QImage):
-            self._image = QPixmap.fromImage(qimage_or_pixmap)
+            if (self._image is not None and self._batch_painter is None
+                    and self._image.size() == qimage_or_pixmap.size()):
+                # same size: overwrite the existing pixmap instead of allocating a new one
+                painter = QPainter(self._image)
+                painter.setCompositionMode(QPainter.CompositionMode_Source)
+                painter.drawImage(0, 0, qimage_or_pixmap)
+                painter.end()
+            else:
+                self._image = QPixmap.fromImage(qimage_or_pixmap)
         else:
             self._image = qimage_or_pixmap
         if self._image:
             self.img_width = self._image.width()
             self.img_height = self._image.height()
+        self._invalidate_transform()
         self.update()
 
+    def _invalidate_transform(self):
+        self._src_rect = None
+        self._transform = None
+
+    def _current_transform(self):
+        # Return cached (src_rect, (sx, sy, ox, oy)); image = widget / s + o
+        if self._transform is None:
+            src = self.current_src_rect()
+            sx = max(1, self.width()) / max(1, src.width())
+            sy = max(1, self.height()) / max(1, src.height())
+            self._src_rect = src
+            self._transform = (sx, sy, src.left(), src.top())
+        return self._src_rect, self._transform
+
+    def resizeEvent(self, event):
+        self._invalidate_transform()
+        super().resizeEvent(event)
+
     def current_src_rect(self):
         # Return the QRect of the image that is currently mapped to the widget rect
         if not self._image or self.img_width == 0 or self.img_height == 0:
@@ -46,17 +100,9 @@ class MarkerImageWidget(QWidget):
             cx, cy = self.zoom_center
             src_w = max(1, int(self.img_width / self.zoom))
             src_h = max(1, int(self.img_height / self.zoom))
-            left = int(cx - src_w // 2)
-            top = int(cy - src_h // 2)
-            # clamp
-            if left < 0:
-                left = 0
-            if top < 0:
-                top = 0
-            if left + src_w > self.img_width:
-                left = self.img_width - src_w
-            if top + src_h > self.img_height:
-                top = self.img_height - src_h
+            # clamp so the source rect stays inside the image
+            left = max(0, min(int(cx - src_w // 2), self.img_width - src_w))
+            top = max(0, min(int(cy - src_h // 2), self.img_height - src_h))
             return QRect(left, top, src_w, src_h)
         else:
             return QRect(0, 0, self.img_width, self.img_height)
@@ -65,23 +111,61 @@ class MarkerImageWidget(QWidget):
         # Map widget coordinates to image pixel coordinates based on current src_rect
         if not self._image:
             return (wx, wy)
-        src = self.current_src_rect()
-        if src.width() <= 0 or src.height() <= 0:
-            return (wx, wy)
-        sx = float(wx) * (src.width() / max(1, self.width())) + src.left()
-        sy = float(wy) * (src.height() / max(1, self.height())) + src.top()
-        return (int(sx), int(sy))
+        _, (sx, sy, ox, oy) = self._current_transform()
+        return (int(wx / sx + ox), int(wy / sy + oy))
 
     def image_to_widget(self, ix, iy):
         # Map image pixel coords to widget coords based on current src_rect
         if not self._image:
             return (ix, iy)
-        src = self.current_src_rect()
-        if src.width() <= 0 or src.height() <= 0:
-            return (ix, iy)
-        wx = (ix - src.left()) * (self.width() / src.width())
-        wy = (iy - src.top()) * (self.height() / src.height())
-        return (int(wx), int(wy))
+        _, (sx, sy, ox, oy) = self._current_transform()
+        return (int((ix - ox) * sx), int((iy - oy) * sy))
+
+    @staticmethod
+    def _to_qcolor(color):
+        # normalize color: QColor, (r,g,b) tuple/list or hex string
+        if isinstance(color, tuple) or isinstance(color, list):
+            return QColor(*color)
+        if isinstance(color, QColor):
+            return color
+        try:
+            return QColor(color)
+        except Exception:
+            return QColor(255, 0, 0)
+
+    def _line_widget_rect(self, x1, y1, x2, y2, width):
+        # bounding box of an image-space line (plus pen width) in widget coords
+        _, (sx, sy, _, _) = self._current_transform()
+        margin = int(width * max(sx, sy)) + 1
+        p1 = QPoint(*self.image_to_widget(x1, y1))
+        p2 = QPoint(*self.image_to_widget(x2, y2))
+        return QRect(p1, p2).normalized().adjusted(-margin, -margin, margin, margin)
+
+    def begin_line_batch(self, color, width: int = 3) -> bool:
+        """Open one painter session on the image for several draw_line_on_image calls.
+
+        The pen is set once here and only changed when a line with a different
+        color/width is drawn. Call end_line_batch() to finish and repaint.
+        """
+        if self._image is None or self._batch_painter is not None:
+            return False
+        qcolor = self._to_qcolor(color)
+        self._batch_painter = QPainter(self._image)
+        self._batch_painter.setPen(QPen(qcolor, width))
+        self._batch_pen = (qcolor.rgba(), width)
+        self._batch_dirty = QRect()
+        return True
+
+    def end_line_batch(self):
+        """Close the painter session from begin_line_batch() and repaint once."""
+        if self._batch_painter is None:
+            return
+        self._batch_painter.end()
+        self._batch_painter = None
+        self._batch_pen = None
+        if not self._batch_dirty.isNull():
+            self.update(self._batch_dirty)
+        self._batch_dirty = QRect()
 
     def draw_line_on_image(self, start: tuple, end: tuple, color, width: int = 3) -> bool:
         """Draw a line directly onto the underlying image (image coordinates).
@@ -92,32 +176,37 @@ class MarkerImageWidget(QWidget):
         - color: QColor or (r,g,b) tuple or hex string.
         - width: line width in pixels.
 
+        Inside begin_line_batch()/end_line_batch() the open painter is reused.
+
         Returns True on success, False otherwise.
         """
         if self._image is None:
             return False
 
-        # normalize color
-        if isinstance(color, tuple) or isinstance(color, list):
-            qcolor = QColor(*color)
-        elif isinstance(color, QColor):
-            qcolor = color
-        else:
+        qcolor = self._to_qcolor(color)
+        x1, y1 = int(start[0]), int(start[1])
+        x2, y2 = int(end[0]), int(end[1])
+
+        if self._batch_painter is not None:
             try:
-                qcolor = QColor(color)
+                pen_key = (qcolor.rgba(), width)
+                if pen_key != self._batch_pen:
+                    self._batch_painter.setPen(QPen(qcolor, width))
+                    self._batch_pen = pen_key
+                self._batch_painter.drawLine(x1, y1, x2, y2)
+                self._batch_dirty = self._batch_dirty.united(self._line_widget_rect(x1, y1, x2, y2, width))
+                return True
             except Exception:
-                qcolor = QColor(255, 0, 0)
+                return False
 
         try:
             painter = QPainter(self._image)
             pen = QPen(qcolor, width)
             painter.setPen(pen)
-            x1, y1 = int(start[0]), int(start[1])
-            x2, y2 = int(end[0]), int(end[1])
             painter.drawLine(x1, y1, x2, y2)
             painter.end()
-            # update widget
-            self.update()
+            # repaint only the line's bounding box
+            self.update(self._line_widget_rect(x1, y1, x2, y2, width))
             return True
         except Exception:
             return False
@@ -125,83 +214,92 @@ class MarkerImageWidget(QWidget):
     def add_marker_group(self, group_id, color):
         if isinstance(color, tuple):
             color = QColor(*color)
-        self.marker_groups[group_id] = {'color': color, 'markers': {}}
+        self.marker_groups[group_id] = {'color': color, 'markers': {}, 'glyph': _make_marker_glyph(color)}
+
+    def _update_marker_area(self, pos):
+        # Schedule a repaint of only the glyph area around a marker (image coords)
+        if pos is None:
+            return
+        wx, wy = self.image_to_widget(pos[0], pos[1])
+        self.update(QRect(wx - _GLYPH_HALF, wy - _GLYPH_HALF, _GLYPH_SIZE, _GLYPH_SIZE))
 
     def set_marker(self, group_id, marker_id, xpos, ypos):
         if group_id not in self.marker_groups:
             raise ValueError(f"Group {group_id} not found")
-        self.marker_groups[group_id]['markers'][marker_id] = (xpos, ypos)
+        markers = self.marker_groups[group_id]['markers']
+        self._update_marker_area(markers.get(marker_id))
+        markers[marker_id] = (xpos, ypos)
+        self._update_marker_area((xpos, ypos))
 
     def get_marker_position(self, group_id, marker_id):
         return self.marker_groups.get(group_id, {}).get('markers', {}).get(marker_id, None)
 
     def unset_marker(self, group_id, marker_id):
         if group_id in self.marker_groups:
-            self.marker_groups[group_id]['markers'].pop(marker_id, None)
+            self._update_marker_area(self.marker_groups[group_id]['markers'].pop(marker_id, None))
 
     def zoom_on_marker(self, group_id, marker_id, zoom_level):
         pos = self.get_marker_position(group_id, marker_id)
         if pos:
             self.zoom = zoom_level
             self.zoom_center = pos
+            self._invalidate_transform()
             self.update()
 
     def reset_zoom(self):
         self.zoom = 1.0
         self.zoom_center = None
+        self._invalidate_transform()
         self.update()
 
-    def draw_markers(self, painter):
+    def draw_markers(self, painter, sx=1.0, sy=1.0, ox=0, oy=0):
+        # sx/sy: image->widget scale, ox/oy: src_rect offset (cached transform)
         for group in self.marker_groups.values():
-            color = group['color']
-            pen = QPen(color, 3)
-            painter.setPen(pen)
+            glyph = group['glyph']
             for (ix, iy) in group['markers'].values():
-                wx, wy = self.image_to_widget(ix, iy)
-                painter.drawEllipse(int(wx)-6, int(wy)-6, 12, 12)
-                painter.drawLine(int(wx)-12, int(wy), int(wx)+12, int(wy))
-                painter.drawLine(int(wx), int(wy)-12, int(wx), int(wy)+12)
+                wx = int((ix - ox) * sx)
+                wy = int((iy - oy) * sy)
+                painter.drawPixmap(wx - _GLYPH_HALF, wy - _GLYPH_HALF, glyph)
 
     def paintEvent(self, event):
+        # nothing to do while hidden (e.g. another view is on top)
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            return
         painter = QPainter(self)
         if self._image:
+            src_rect, transform = self._current_transform()
             if self.zoom != 1.0 and self.zoom_center:
-                src_rect = self.current_src_rect()
                 painter.drawPixmap(self.rect(), self._image, src_rect)
             else:
                 painter.drawPixmap(self.rect(), self._image)
-        self.draw_markers(painter)
+            self.draw_markers(painter, *transform)
+        else:
+            self.draw_markers(painter)
 
     def mousePressEvent(self, event):
         wx, wy = event.x(), event.y()
         # convert widget coordinates to image pixel coordinates
         ix, iy = self.widget_to_image(wx, wy)
-        # Example: place marker in group 1, id 0
+        # Example: place marker in group 1, id 0 (set_marker schedules the repaint)
         self.set_marker(1, 0, ix, iy)
-        self.update()
 
     def get_markers_for_axes(self):
-        """Return marker groups as lists suitable for axis computation.
+        """Return marker groups as arrays suitable for axis computation.
 
-        Returns a dict with keys 'xt','xb','yl','yr' each mapping to a list of
-        (x,y) tuples in image pixel coordinates.
+        Returns a dict with keys 'xt','xb','yl','yr' each mapping to an (N, 2)
+        float array of (x, y) points in image pixel coordinates, relative to the
+        image center.
         """
-        out = {'xt': [], 'xb': [], 'yl': [], 'yr': []}
+        out = {}
         # center for conversion from top-left origin to image-center origin
-        cx = float(self.img_width) / 2.0
-        cy = float(self.img_height) / 2.0
+        center = np.array((self.img_width / 2.0, self.img_height / 2.0))
         for gid, key in ((0, 'xt'), (1, 'xb'), (2, 'yl'), (3, 'yr')):
             grp = self.marker_groups.get(gid, {})
             markers = grp.get('markers', {}) if isinstance(grp, dict) else {}
             # markers may be dict of id:(x,y) pairs
-            pts = []
             if isinstance(markers, dict):
-                for v in markers.values():
-                    # stored coordinates are image pixels with (0,0) at top-left
-                    # convert to centered coordinates (origin at image center)
-                    pts.append((float(v[0]) - cx, float(v[1]) - cy))
-            elif isinstance(markers, (list, tuple)):
-                for v in markers:
-                    pts.append((float(v[0]) - cx, float(v[1]) - cy))
-            out[key] = pts
+                markers = list(markers.values())
+            # stored coordinates are image pixels with (0,0) at top-left
+            pts = np.asarray(markers, dtype=np.float64).reshape(-1, 2)
+            out[key] = pts - center
         return out
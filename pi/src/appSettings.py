@@ -6,16 +6,41 @@ Handles camera selection, calibration settings, and global config.
 
 # Imports
 import os
+import copy
 import json
-import subprocess
+import threading
+from contextlib import contextmanager
 
-from pydantic import BaseSettings
+# Optional: orjson parses/serializes the settings file considerably faster; fall back to stdlib json
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode()
 
 # Constants and global variables
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "..", "res", "app_settings.json")
 _ACTIVE_CAMERA_INDEX = None
 _ACTIVE_CAMERA_ID = None
 
+# In-memory cache of the parsed settings file (invalidated by file mtime)
+_SETTINGS_CACHE = None
+_SETTINGS_MTIME = 0
+
+# Serializes file writes (GUI thread and the background writer in caliDevice);
+# the generation counter lets a staged write notice that a newer save superseded it
+_WRITE_LOCK = threading.Lock()
+_SETTINGS_GENERATION = 0
+
 # Global debug flags
 _DEBUG_MODE = False
 _DEBUG_NO_CAM = False
@@ -55,14 +80,43 @@ def get_checkerboard_config():
 
 # Used in caliDistortion.py, caliPerspective.py, camera.py (load calibration settings)
 def get_calibration_settings():
-    """Get calibration settings from config."""
-    return get_app_settings()["calibration_settings"]
+    """Get calibration settings from config (read-only, do not mutate)."""
+    return get_app_settings_readonly()["calibration_settings"]
 
 
 
 # Used in caliDevice.py, camera.py, main.py, caliSelect.py (load all app settings)
 def get_app_settings():
-    """Load saved camera settings from JSON file."""
+    """Load saved camera settings from JSON file.
+
+    Returns a private copy that callers may mutate and pass to
+    save_camera_settings().
+    """
+    return copy.deepcopy(get_app_settings_readonly())
+
+
+def get_app_settings_readonly():
+    """Return the cached settings dict without copying.
+
+    The file is only re-read and re-parsed when its mtime changed. Callers
+    must not mutate the returned dict; use get_app_settings() for that.
+    """
+    global _SETTINGS_CACHE, _SETTINGS_MTIME
+    try:
+        mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None and _SETTINGS_CACHE is not None and mtime == _SETTINGS_MTIME:
+        return _SETTINGS_CACHE
+    settings = _load_app_settings()
+    if mtime is not None and settings:
+        _SETTINGS_CACHE = settings
+        _SETTINGS_MTIME = mtime
+    return settings
+
+
+def _load_app_settings():
+    """Read and parse the settings file (creates it with defaults if missing)."""
     if not os.path.exists(SETTINGS_FILE):
         print("[LOG] No settings file found, creating with defaults")
         settings = {}
@@ -77,8 +131,8 @@ def get_app_settings():
         save_camera_settings(settings)
         return settings
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            settings = json.load(f)
+        with open(SETTINGS_FILE, 'rb') as f:
+            settings = _loads(f.read())
             print(f"[LOG] Loaded settings for {len(settings)} camera(s)")
             return settings
     except Exception as e:
@@ -90,21 +144,27 @@ def get_app_settings():
 # Used in caliDevice.py, camera.py, main.py (read hardware settings)
 def get_hardware_settings():
     """Return hardware_setting from app settings (read-only)."""
-    settings = get_app_settings()
+    settings = get_app_settings_readonly()
     return settings.get("hardware_setting", {})
 
 
 # Used in caliDevice.py, main.py, camera.py (set selected camera globally)
-def set_active_camera(camera_index, camera_id):
-    """Set the currently selected camera (global for all windows) and persist to settings file."""
+def set_active_camera(camera_index, camera_id, persist=True):
+    """Set the currently selected camera (global for all windows).
+
+    With persist=True the selection is also written to the settings file.
+    Pass persist=False when the caller writes active_camera itself in the
+    same transaction (e.g. save_current_camera_settings).
+    """
     global _ACTIVE_CAMERA_INDEX, _ACTIVE_CAMERA_ID
     _ACTIVE_CAMERA_INDEX = camera_index
     _ACTIVE_CAMERA_ID = camera_id
     print(f"[LOG] Selected camera set to index={camera_index}, id={camera_id}")
+    if not persist:
+        return
     try:
-        settings = get_app_settings()
-        settings['active_camera'] = {'id': camera_id, 'device': camera_index}
-        save_camera_settings(settings)
+        with settings_transaction() as settings:
+            settings['active_camera'] = {'id': camera_id, 'device': camera_index}
         print(f"[LOG] Persisted active_camera to settings: id={camera_id}, device={camera_index}")
     except Exception as e:
         print(f"[ERROR] Could not persist active_camera to settings: {e}")
@@ -123,12 +183,25 @@ def get_active_camera_id():
 # Used in caliDevice.py, camera.py, main.py (save all app settings to disk)
 def save_camera_settings(settings):
     """Save camera settings to JSON file."""
+    global _SETTINGS_GENERATION
+    with _WRITE_LOCK:
+        _SETTINGS_GENERATION += 1
+        return _write_settings_file(settings)
+
+
+def _write_settings_file(settings):
+    """Write settings atomically (caller holds _WRITE_LOCK)."""
     try:
         os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
         print(f"[DEBUG] Saving settings to: {SETTINGS_FILE}")
-        print(f"[DEBUG] Settings dict: {json.dumps(settings, indent=2)}")
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=4)
+        if is_debug_mode():
+            print(f"[DEBUG] Settings dict: {json.dumps(settings, indent=2)}")
+        # Write to a sibling temp file and rename, so a power loss never leaves a half-written file
+        tmp_file = SETTINGS_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(settings))
+        os.replace(tmp_file, SETTINGS_FILE)
+        _update_settings_cache(settings)
         print(f"[LOG] Settings saved to {SETTINGS_FILE}")
         return True
     except Exception as e:
@@ -136,11 +209,95 @@ def save_camera_settings(settings):
         return False
 
 
+@contextmanager
+def settings_transaction(settings=None):
+    """Load the settings once, yield them for mutation and write them once.
+
+    Usage:
+        with settings_transaction() as s:
+            s['active_camera'] = {...}
+
+    If `settings` is given, that dict is used instead of reloading the file.
+    Nothing is written if the body raises.
+    """
+    if settings is None:
+        settings = get_app_settings()
+    yield settings
+    if not save_camera_settings(settings):
+        raise IOError(f"Could not write settings to {SETTINGS_FILE}")
+
+
+def stage_settings(settings):
+    """Make `settings` visible to readers now and defer the file write.
+
+    Returns a token for write_staged_settings(). Readers of
+    get_app_settings()/get_app_settings_readonly() see the staged dict
+    immediately, before it reaches the disk.
+    """
+    global _SETTINGS_GENERATION
+    with _WRITE_LOCK:
+        _SETTINGS_GENERATION += 1
+        _update_settings_cache(settings)
+        return _SETTINGS_GENERATION
+
+
+def write_staged_settings(settings, generation):
+    """Write settings staged with stage_settings() (safe to call from a worker thread).
+
+    Skips the write if a newer stage/save happened in the meantime.
+    """
+    with _WRITE_LOCK:
+        if generation != _SETTINGS_GENERATION:
+            return True
+        return _write_settings_file(settings)
+
+
+def sync_settings_file():
+    """fsync the settings file and its directory (call on clean shutdown)."""
+    with _WRITE_LOCK:
+        try:
+            with open(SETTINGS_FILE, 'rb') as f:
+                os.fsync(f.fileno())
+            dir_fd = os.open(os.path.dirname(SETTINGS_FILE), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError as e:
+            print(f"[ERROR] Could not sync settings file: {e}")
+
+
+def _update_settings_cache(settings):
+    """Refresh the in-memory cache after the settings file was written."""
+    global _SETTINGS_CACHE, _SETTINGS_MTIME
+    try:
+        _SETTINGS_MTIME = os.stat(SETTINGS_FILE).st_mtime_ns
+        _SETTINGS_CACHE = copy.deepcopy(settings)
+    except OSError:
+        _SETTINGS_CACHE = None
+        _SETTINGS_MTIME = 0
+
+
 # Used in caliDevice.py (save current camera settings and calibration)
 def save_current_camera_settings(saved_settings, camera_id, camera_index, current_format, current_resolution, current_fps):
     """Update and save camera settings, including calibration and active_camera."""
-    if not camera_id:
+    if not update_current_camera_settings(saved_settings, camera_id, camera_index,
+                                          current_format, current_resolution, current_fps):
         return
+    # Camera entry and active_camera are written in a single load/dump cycle
+    if save_camera_settings(saved_settings):
+        print(f"[LOG] Saved settings for camera {camera_id}")
+    else:
+        print(f"[ERROR] Failed to save settings for camera {camera_id}")
+
+
+def update_current_camera_settings(saved_settings, camera_id, camera_index, current_format, current_resolution, current_fps):
+    """Write the camera entry and active_camera into `saved_settings` (no file I/O).
+
+    Returns False if there is no camera_id to store.
+    """
+    if not camera_id:
+        return False
 
     existing_settings = saved_settings.get(camera_id, {})
     format_changed = existing_settings.get('format') != current_format
@@ -167,18 +324,9 @@ def save_current_camera_settings(saved_settings, camera_id, camera_index, curren
         'fps': int(current_fps),
         'intrinsic': calibration_data
     }
-
-    # Ensure active_camera in this in-memory dict matches the runtime selection
-    try:
-        saved_settings['active_camera'] = {'id': camera_id, 'device': camera_index}
-    except Exception:
-        saved_settings = get_app_settings()
-        saved_settings['active_camera'] = {'id': camera_id, 'device': camera_index}
-
-    if save_camera_settings(saved_settings):
-        print(f"[LOG] Saved settings for camera {camera_id}")
-    else:
-        print(f"[ERROR] Failed to save settings")
+    # Ensure active_camera matches the runtime selection
+    saved_settings['active_camera'] = {'id': camera_id, 'device': camera_index}
+    return True
 
 
 
@@ -186,21 +334,21 @@ def save_current_camera_settings(saved_settings, camera_id, camera_index, curren
 # Used in caliPerspective.py, camera.py, caliDevice.py (get settings for a specific camera)
 def get_camera_settings(camera_id):
     """Return the settings dict for the given camera_id from the app settings file, or an empty dict if not found."""
-    settings = get_app_settings()
-    return settings.get(camera_id, {})
+    settings = get_app_settings_readonly()
+    return copy.deepcopy(settings.get(camera_id, {}))
 
 def get_active_camera_settings():
-    settings = get_app_settings()
-    return settings.get(_ACTIVE_CAMERA_ID, {})
+    settings = get_app_settings_readonly()
+    return copy.deepcopy(settings.get(_ACTIVE_CAMERA_ID, {}))
 
 # Used in caliPerspective.py, camera.py, caliDevice.py (get calibration for a specific camera)
 def get_camera_intrinsic_parameter(camera_id):
     """Return the calibration dict for the given camera_id from the app settings file, or an empty dict if not found."""
     if camera_id is None:
         camera_id=get_active_camera()
-    settings = get_app_settings()
+    settings = get_app_settings_readonly()
     camera_settings = settings.get(camera_id, {})
-    return camera_settings.get('intrinsic', {})
+    return copy.deepcopy(camera_settings.get('intrinsic', {}))
 
 
 def set_active_cam_settings(cam_settings: dict) -> bool:
@@ -5,21 +5,161 @@ Settings Window Logik
 - Trennung von UI (settingswindow.py) und Logik
 """
 
-import cv2
-from PyQt5.QtWidgets import QMainWindow, QGraphicsScene, QGraphicsPixmapItem, QTreeWidgetItem
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QImage, QPixmap
+from contextlib import contextmanager
+from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsScene, QGraphicsItem, QGraphicsView, QTreeWidgetItem
+from PyQt5.QtCore import Qt, QSize, QTimer, QRectF, QObject, QThread, QThreadPool, QFileSystemWatcher, pyqtSignal
 from caliDeviceWin import Ui_MainWindow as Ui_SettingsWindow
 
+import os
+import copy
+import queue
+import threading
 import appSettings
 import camera
 
+# Item-Daten der Device-Children: Kamera-Index (int), damit der Klick nicht das Label parsen muss
+_CAMERA_INDEX_ROLE = Qt.UserRole + 1
 
 
 # Use appSettings for camera selection and persistence (call directly via appSettings)
 
 
+class FrameItem(QGraphicsItem):
+    """Zeigt das aktuelle Kamerabild direkt als QImage an.
 
+    Spart pro Frame die Konvertierung und den Upload von QPixmap.fromImage,
+    da das Bild nur angezeigt und nicht weiter komponiert wird.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._qimage = None
+        # numpy-Puffer hinter _qimage; das QImage selbst hält ihn nicht am Leben
+        self._buffer = None
+        self._rect = QRectF()
+
+    def set_image(self, qimage, buffer=None):
+        if qimage.width() != self._rect.width() or qimage.height() != self._rect.height():
+            self.prepareGeometryChange()
+            self._rect = QRectF(0, 0, qimage.width(), qimage.height())
+        self._qimage = qimage
+        self._buffer = buffer
+        self.update()
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        if self._qimage is not None:
+            painter.drawImage(self._rect, self._qimage)
+
+
+class CameraProbeWorker(QObject):
+    """Ermittelt Kamera-IDs und Capabilities (udevadm, v4l2-ctl) außerhalb des GUI-Threads.
+
+    Emittiert `probed` mit {camera_index: (camera_id, capabilities)}.
+    Für Kamera-IDs in `known_caps` wird v4l2-ctl nicht erneut aufgerufen.
+    """
+
+    probed = pyqtSignal(dict)
+
+    def __init__(self, indices=None, known_caps=None):
+        super().__init__()
+        # None: alle vorhandenen Video-Devices prüfen
+        self.indices = indices
+        self.known_caps = known_caps or {}
+
+    def run(self):
+        indices = self.indices if self.indices is not None else camera.list_video_devices()
+        ids = {idx: camera.get_camera_id(idx) for idx in indices}
+        # v4l2-ctl nur für unbekannte Kameras, alle gleichzeitig
+        missing = [idx for idx in indices if not self.known_caps.get(ids[idx])]
+        probed_caps = camera.get_all_camera_capabilities(missing)
+        result = {}
+        for idx in indices:
+            capabilities = self.known_caps.get(ids[idx]) or probed_caps.get(idx, {})
+            result[idx] = (ids[idx], capabilities)
+        self.probed.emit(result)
+
+
+class _SettingsWriter(QThread):
+    """Schreibt app_settings.json im Hintergrund, damit OK nicht auf die SD-Karte wartet.
+
+    enqueue() macht die Settings sofort über den appSettings-Cache sichtbar und
+    reicht den Snapshot an den Thread weiter; bei schnellen Folgeaufrufen wird nur
+    der neueste geschrieben (Queue mit maxsize=1, älterer Eintrag wird verworfen).
+    Der Thread läuft nur, solange etwas zu schreiben ist. flush() wartet auf den
+    letzten Schreibvorgang und macht fsync (beim Schließen).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._queue = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._active = False
+        self._dirty = False
+
+    def enqueue(self, settings):
+        snapshot = copy.deepcopy(settings)
+        generation = appSettings.stage_settings(snapshot)
+        with self._lock:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait((snapshot, generation))
+            if not self._active:
+                self._active = True
+                self.wait()  # vorheriger Lauf ist evtl. noch nicht ganz beendet
+                self.start()
+
+    def run(self):
+        while True:
+            with self._lock:
+                try:
+                    snapshot, generation = self._queue.get_nowait()
+                except queue.Empty:
+                    self._active = False
+                    return
+            self._dirty = True
+            appSettings.write_staged_settings(snapshot, generation)
+
+    def flush(self):
+        """Warte auf ausstehende Schreibvorgänge und synchronisiere die Datei auf die Platte"""
+        self.wait()
+        if self._dirty:
+            self._dirty = False
+            appSettings.sync_settings_file()
+
+
+_SETTINGS_WRITER = None
+
+# Gestoppte Capture-Threads, die noch auslaufen; die Referenz verhindert, dass der GC
+# einen noch laufenden QThread zerstört (siehe CalibrationDeviceWindow.stop_camera)
+_STOPPING_THREADS = set()
+
+
+def _join_stopped_thread(thread):
+    """Thread-Pool: auf das Ende eines gestoppten Capture-Threads warten und ihn freigeben"""
+    thread.wait()
+    _STOPPING_THREADS.discard(thread)
+
+
+def wait_for_stopped_threads():
+    """Warte auf alle noch auslaufenden Capture-Threads (beim Schließen)"""
+    for thread in list(_STOPPING_THREADS):
+        thread.wait()
+
+
+def settings_writer():
+    """Gemeinsamer _SettingsWriter (überlebt das Fenster, Flush beim Beenden der App)"""
+    global _SETTINGS_WRITER
+    if _SETTINGS_WRITER is None:
+        _SETTINGS_WRITER = _SettingsWriter()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_SETTINGS_WRITER.flush)
+    return _SETTINGS_WRITER
 
 
 class CalibrationDeviceWindow(QMainWindow):
@@ -43,9 +183,15 @@ class CalibrationDeviceWindow(QMainWindow):
         
         # Graphics View Setup
         self.scene = QGraphicsScene()
-        self.pixmap_item = QGraphicsPixmapItem()
-        self.scene.addItem(self.pixmap_item)
+        self.frame_item = FrameItem()
+        self.scene.addItem(self.frame_item)
         self.ui.gvCamera.setScene(self.scene)
+        # Video füllt immer die ganze View: per OpenGL zeichnen und keine Dirty-Regions berechnen
+        camera.setup_gl_viewport(self.ui.gvCamera)
+        self.ui.gvCamera.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Kein Antialiasing-Rand und kein save/restore des Painters pro Item nötig
+        self.ui.gvCamera.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+        self.ui.gvCamera.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
 
         # Get screen size from hardware settings
         hardware_settings = appSettings.get_hardware_settings()
@@ -63,9 +209,15 @@ class CalibrationDeviceWindow(QMainWindow):
         self.ui.gvCamera.setMinimumWidth(camera_width)
         self.ui.gvCamera.setMaximumHeight(camera_height)
         self.ui.gvCamera.setMinimumHeight(camera_height)
+        self.camera_view_size = (camera_width, camera_height)
+
+        # Szene enthält nur das Kamerabild: kein BSP-Index, feste Scene-Rect
+        # (VideoThread liefert bereits auf die View verkleinerte Frames), keine Interaktion
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.scene.setSceneRect(0, 0, camera_width, camera_height)
+        self.ui.gvCamera.setInteractive(False)
 
         # Deaktiviere Scrollbars
-        from PyQt5.QtCore import Qt
         self.ui.gvCamera.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.ui.gvCamera.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
@@ -78,7 +230,7 @@ class CalibrationDeviceWindow(QMainWindow):
         # Entferne MenuBar (falls vorhanden)
         self.setMenuBar(None)
         
-        # Video Thread
+        # Video Thread (camera.VideoPipeline, wird in start_video_pipeline erzeugt)
         self.video_thread = None
         
         # Aktuelle Kamera-Einstellungen (temporär für dieses Fenster)
@@ -99,28 +251,133 @@ class CalibrationDeviceWindow(QMainWindow):
         self.resolution_item = None
         self.fps_item = None
         self.format_item = None
+        # Feste Zeilenhöhe aller Items (einmal erzeugt, in set_item_height wiederverwendet)
+        self._ROW_SIZE_HINT = QSize(0, 44)
+        # Vorab erzeugte Children: {format: [res items]}, {(format, res): [fps items]}
+        self._res_items = {}
+        self._fps_items = {}
+        
+        # Ergebnisse des Kamera-Probings (vom CameraProbeWorker gefüllt)
+        self._probe_result = None
+        self._ids_by_index = {}
+        self._single_probe = None
+        # Gefundene Video-Devices; aktualisiert per QFileSystemWatcher auf /dev statt Polling
+        self._devices = []
+        self._cameras_cache = None
+        self._dev_nodes = self._list_dev_nodes()
+        self._dev_probe = None
+        self._dev_watcher = QFileSystemWatcher(['/dev'], self)
+        self._dev_refresh_timer = QTimer(self)
+        self._dev_refresh_timer.setSingleShot(True)
+        self._dev_refresh_timer.setInterval(300)
+        self._dev_refresh_timer.timeout.connect(self._refresh_devices)
+        self._dev_watcher.directoryChanged.connect(self._dev_refresh_timer.start)
+        # Capabilities je Kamera-ID (stabil bei /dev/videoN-Umnummerierung);
+        # zweite Ebene: "capabilities_cache" in app_settings.json
+        self._caps_cache = {}
+        
+        # Schnelle Klicks auf Resolution/FPS/Format sammeln: Kamera erst 150 ms nach dem letzten Klick neu öffnen
+        self._restart_timer = QTimer(self)
+        self._restart_timer.setSingleShot(True)
+        self._restart_timer.setInterval(150)
+        self._restart_timer.timeout.connect(self.start_camera_with_settings)
+        self._last_cfg_tuple = None
         
         # Initialisierung
         self.setup_connections()
-        self.setup_tree_view()
-        
-        # Auto-load Kamera wenn Settings vorhanden
-        self.auto_load_camera_with_settings()
+        self.start_video_pipeline()
+        
+        # Kamera-Probing im Hintergrund starten
+        self._probe_thread = QThread(self)
+        self._probe_worker = CameraProbeWorker(known_caps=dict(self.saved_settings.get("capabilities_cache", {})))
+        self._probe_worker.moveToThread(self._probe_thread)
+        self._probe_thread.started.connect(self._probe_worker.run)
+        self._probe_worker.probed.connect(self._on_probe_done)
+        self._probe_worker.probed.connect(self._probe_thread.quit)
+        self._probe_thread.start()
+        
+        # TreeView und Kamera-Probing (v4l2-ctl, udevadm) erst nach dem ersten Paint,
+        # damit das Fenster sofort sichtbar ist
+        self._deferred_init_done = False
+        QTimer.singleShot(0, self._deferred_init)
         
         # Fenster-Titel
         self.setWindowTitle("Settings")
         
         print("[LOG] Settings view loaded")
     
+    def _deferred_init(self):
+        """Fülle TreeView und lade Kamera (nur einmal, nach dem ersten Paint)"""
+        if self._deferred_init_done:
+            return
+        self._deferred_init_done = True
+        self.setup_tree_view()
+        
+        # Auto-load Kamera wenn Settings vorhanden (sonst nach dem Probing)
+        if self._probe_result is not None:
+            self.auto_load_camera_with_settings()
+    
+    def _on_probe_done(self, result):
+        """Slot (GUI-Thread): Probing fertig, Device-Liste füllen und Kamera laden"""
+        self._probe_result = result
+        self._devices = list(result.keys())
+        self._cameras_cache = None
+        for idx, (camera_id, capabilities) in result.items():
+            self._ids_by_index[idx] = camera_id
+        self._store_caps({camera_id: caps for camera_id, caps in result.values()})
+        print(f"[LOG] Camera probing done: {len(result)} device(s)")
+        if self._deferred_init_done:
+            self.populate_device_items(self._devices)
+            self.auto_load_camera_with_settings()
+    
+    @staticmethod
+    def _list_dev_nodes():
+        """Namen der /dev/video*-Knoten (nur ein listdir, kein Öffnen der Devices)"""
+        try:
+            return {name for name in os.listdir('/dev') if name.startswith('video')}
+        except OSError:
+            return set()
+    
+    def _refresh_devices(self):
+        """Slot: /dev hat sich geändert; bei neuen/entfernten video*-Knoten Devices neu proben"""
+        nodes = self._list_dev_nodes()
+        if nodes == self._dev_nodes:
+            return
+        self._dev_nodes = nodes
+        print(f"[LOG] Video devices changed, re-probing")
+        # list_video_devices öffnet die Devices, daher im Thread-Pool
+        self._dev_probe = CameraProbeWorker(known_caps=dict(self._caps_cache))
+        self._dev_probe.probed.connect(self._on_devices_changed)
+        QThreadPool.globalInstance().start(self._dev_probe.run)
+    
+    def _on_devices_changed(self, result):
+        """Slot (GUI-Thread): Ergebnis von _refresh_devices übernehmen und Device-Ast neu füllen"""
+        self._dev_probe = None
+        self._probe_result = result
+        self._devices = list(result.keys())
+        self._cameras_cache = None
+        for idx, (camera_id, capabilities) in result.items():
+            self._ids_by_index[idx] = camera_id
+        self._store_caps({camera_id: caps for camera_id, caps in result.values()})
+        if self._deferred_init_done:
+            self.populate_device_items(self._devices)
+    
     def auto_load_camera_with_settings(self):
         """Lade automatisch Kamera wenn Settings vorhanden sind"""
         # Prüfe ob es eine gespeicherte "active_camera" gibt
         selected_cam_id = self.saved_settings.get("active_camera", {}).get("id")
-        devices = camera.list_video_devices()
+        devices = self._devices
         if selected_cam_id:
             print(f"[LOG] Trying to load previously selected camera: {selected_cam_id}")
+            # Schneller Pfad: zuerst den zuletzt benutzten Device-Index prüfen
+            hint_index = self.get_last_used_device(selected_cam_id)
+            if hint_index in devices and selected_cam_id in self.saved_settings:
+                if self._ids_by_index.get(hint_index) == selected_cam_id:
+                    print(f"[LOG] Found previously selected camera {hint_index} (last used)")
+                    self.load_camera(hint_index, selected_cam_id)
+                    return
             for i in devices:
-                camera_id = camera.get_camera_id(i)
+                camera_id = self._ids_by_index.get(i)
                 if camera_id == selected_cam_id and camera_id in self.saved_settings:
                     print(f"[LOG] Found previously selected camera {i}")
                     self.load_camera(i, camera_id)
@@ -128,12 +385,19 @@ class CalibrationDeviceWindow(QMainWindow):
             print(f"[LOG] Previously selected camera not found, searching for alternatives...")
         # Fallback: Suche nach irgendeiner angeschlossener Kamera mit Settings
         for i in devices:
-            camera_id = camera.get_camera_id(i)
+            camera_id = self._ids_by_index.get(i)
             if camera_id in self.saved_settings:
                 print(f"[LOG] Auto-loading camera {i} with saved settings")
                 self.load_camera(i, camera_id)
                 break
     
+    def get_last_used_device(self, camera_id):
+        """Gib den gespeicherten Device-Index der aktiven Kamera zurück, falls sie camera_id ist (sonst None)"""
+        entry = self.saved_settings.get("active_camera", {})
+        if entry.get("id") == camera_id:
+            return entry.get("device")
+        return None
+    
     def load_camera(self, camera_index, camera_id):
         """Lade eine Kamera mit ihren Settings"""
         # Setze Kamera-Index und ID (temporär)
@@ -142,8 +406,8 @@ class CalibrationDeviceWindow(QMainWindow):
         
         # NICHT global setzen beim Auto-Load - nur temporär!
         
-        # Lese Capabilities
-        capabilities = camera.get_camera_capabilities(camera_index)
+        # Capabilities aus dem Cache (Fallback: v4l2-ctl)
+        capabilities = self._get_caps(camera_index, camera_id)
         self.camera_capabilities = capabilities
         
         # Aktiviere und fülle TreeView
@@ -172,11 +436,112 @@ class CalibrationDeviceWindow(QMainWindow):
         # Suche nach dem entsprechenden Item
         for i in range(self.device_item.childCount()):
             child = self.device_item.child(i)
-            if f"Camera {camera_index}" in child.text(0):
+            if child.data(0, _CAMERA_INDEX_ROLE) == camera_index:
                 # Setze als current item (markiert)
                 self.ui.tvSettings.setCurrentItem(child)
                 break
         
+    def select_device(self, camera_index):
+        """Wähle Kamera temporär aus (Capabilities müssen im Cache sein) und starte sie"""
+        self.current_camera_index = camera_index
+        
+        # Kamera-ID und Capabilities aus dem Probing
+        self.current_camera_id = self._ids_by_index.get(camera_index) or camera.get_camera_id(camera_index)
+        print(f"[LOG] Camera {camera_index} selected temporarily (ID: {self.current_camera_id})")
+        
+        # NICHT global setzen - nur temporär in diesem Fenster!
+        # Wird erst bei OK übernommen
+        
+        capabilities = self._get_caps(camera_index, self.current_camera_id)
+        self.camera_capabilities = capabilities
+        
+        # Aktiviere und fülle andere Tree Items mit tatsächlichen Werten
+        self.populate_format_options(capabilities)
+        self.resolution_item.setDisabled(False)
+        self.fps_item.setDisabled(False)
+        self.format_item.setDisabled(False)
+        print("[LOG] Updated tree items with camera capabilities")
+        
+        # Prüfe ob gespeicherte Settings für diese Kamera existieren
+        if self.current_camera_id in self.saved_settings:
+            saved = self.saved_settings[self.current_camera_id]
+            print(f"[LOG] Loading saved settings for camera: {saved}")
+            
+            # Restore gespeicherte Werte
+            self.current_format = saved.get('format', list(capabilities.keys())[0])
+            self.current_resolution = saved.get('resolution', list(capabilities[self.current_format].keys())[0])
+            self.current_fps = str(saved.get('fps', capabilities[self.current_format][self.current_resolution][0]))
+            
+            # Update TreeView mit gespeicherten Werten
+            self.update_resolution_fps_for_format(self.current_format)
+        else:
+            # Wähle erstes verfügbares Format als Default
+            if capabilities:
+                first_format = list(capabilities.keys())[0]
+                self.current_format = first_format
+                
+                # Wähle erste verfügbare Auflösung
+                if capabilities[first_format]:
+                    first_resolution = list(capabilities[first_format].keys())[0]
+                    self.current_resolution = first_resolution
+                    
+                    # Wähle erste verfügbare FPS
+                    if capabilities[first_format][first_resolution]:
+                        first_fps = str(capabilities[first_format][first_resolution][0])
+                        self.current_fps = first_fps
+        
+        # Starte Kamera
+        self.start_camera_with_settings()
+    
+    def _on_single_probe_done(self, result):
+        """Slot (GUI-Thread): Einzel-Probing aus on_tree_item_clicked fertig"""
+        for idx, (camera_id, capabilities) in result.items():
+            self._ids_by_index[idx] = camera_id
+            self._store_caps({camera_id: capabilities})
+            self.select_device(idx)
+        self._single_probe = None
+    
+    def _get_caps(self, camera_index, camera_id):
+        """Capabilities aus Speicher- bzw. Datei-Cache, sonst per v4l2-ctl abfragen"""
+        capabilities = self._caps_cache.get(camera_id)
+        if capabilities:
+            return capabilities
+        capabilities = self.saved_settings.get("capabilities_cache", {}).get(camera_id)
+        if capabilities:
+            self._caps_cache[camera_id] = capabilities
+            return capabilities
+        capabilities = camera.get_camera_capabilities(camera_index)
+        self._store_caps({camera_id: capabilities})
+        return capabilities
+    
+    def _store_caps(self, caps_by_id):
+        """Capabilities im Speicher ablegen und neue Einträge im Hintergrund in die Settings-Datei schreiben"""
+        disk_cache = self.saved_settings.setdefault("capabilities_cache", {})
+        changed = {}
+        for camera_id, capabilities in caps_by_id.items():
+            if not camera_id or not capabilities:
+                continue
+            self._caps_cache[camera_id] = capabilities
+            if disk_cache.get(camera_id) != capabilities:
+                disk_cache[camera_id] = capabilities
+                changed[camera_id] = capabilities
+        if changed:
+            # Kein JSON-Dump/Schreiben im GUI-Slot: über den _SettingsWriter
+            settings = appSettings.get_app_settings()
+            settings.setdefault("capabilities_cache", {}).update(changed)
+            settings_writer().enqueue(settings)
+    
+    def _on_camera_open_failed(self, camera_index):
+        """Kamera ließ sich nicht öffnen: gecachte Capabilities verwerfen"""
+        self._last_cfg_tuple = None
+        camera_id = self._ids_by_index.get(camera_index, self.current_camera_id)
+        self._caps_cache.pop(camera_id, None)
+        if self.saved_settings.get("capabilities_cache", {}).pop(camera_id, None) is not None:
+            settings = appSettings.get_app_settings()
+            settings.get("capabilities_cache", {}).pop(camera_id, None)
+            settings_writer().enqueue(settings)
+        print(f"[LOG] Dropped cached capabilities for camera {camera_index} (ID: {camera_id})")
+        
     def on_tree_item_clicked(self, item, column):
         """Callback wenn TreeView Item geklickt wird"""
         item_type = item.data(0, Qt.UserRole)
@@ -193,70 +558,23 @@ class CalibrationDeviceWindow(QMainWindow):
         
         # Ab hier: nur Child-Items
         if item_type == "device":
-            # Kamera wurde ausgewählt
-            # Extrahiere Camera Index (z.B. "Camera 0 (/dev/video0)" -> 0)
-            if "Camera" in item_text and "No cameras" not in item_text:
-                try:
-                    camera_index = int(item_text.split()[1])
-                    self.current_camera_index = camera_index
-                    
-                    # Ermittle Kamera-ID
-                    self.current_camera_id = camera.get_camera_id(camera_index)
-                    print(f"[LOG] Camera {camera_index} selected temporarily (ID: {self.current_camera_id})")
-                    
-                    # NICHT global setzen - nur temporär in diesem Fenster!
-                    # Wird erst bei OK übernommen
-                    
-                    # Schließe alle anderen Äste (Resolution, FPS, Format)
-                    self.resolution_item.setExpanded(False)
-                    self.fps_item.setExpanded(False)
-                    self.format_item.setExpanded(False)
-                    print("[LOG] Collapsed all tree items (Resolution, FPS, Format)")
-                    
-                    # Lese Kamera-Capabilities mit v4l2-ctl
-                    capabilities = camera.get_camera_capabilities(camera_index)
-                    self.camera_capabilities = capabilities
-                    
-                    # Aktiviere und fülle andere Tree Items mit tatsächlichen Werten
-                    self.populate_format_options(capabilities)
-                    self.resolution_item.setDisabled(False)
-                    self.fps_item.setDisabled(False)
-                    self.format_item.setDisabled(False)
-                    print("[LOG] Updated tree items with camera capabilities")
-                    
-                    # Prüfe ob gespeicherte Settings für diese Kamera existieren
-                    if self.current_camera_id in self.saved_settings:
-                        saved = self.saved_settings[self.current_camera_id]
-                        print(f"[LOG] Loading saved settings for camera: {saved}")
-                        
-                        # Restore gespeicherte Werte
-                        self.current_format = saved.get('format', list(capabilities.keys())[0])
-                        self.current_resolution = saved.get('resolution', list(capabilities[self.current_format].keys())[0])
-                        self.current_fps = str(saved.get('fps', capabilities[self.current_format][self.current_resolution][0]))
-                        
-                        # Update TreeView mit gespeicherten Werten
-                        self.update_resolution_fps_for_format(self.current_format)
-                    else:
-                        # Wähle erstes verfügbares Format als Default
-                        if capabilities:
-                            first_format = list(capabilities.keys())[0]
-                            self.current_format = first_format
-                            
-                            # Wähle erste verfügbare Auflösung
-                            if capabilities[first_format]:
-                                first_resolution = list(capabilities[first_format].keys())[0]
-                                self.current_resolution = first_resolution
-                                
-                                # Wähle erste verfügbare FPS
-                                if capabilities[first_format][first_resolution]:
-                                    first_fps = str(capabilities[first_format][first_resolution][0])
-                                    self.current_fps = first_fps
-                    
-                    # Starte Kamera
-                    self.start_camera_with_settings()
-                    
-                except (IndexError, ValueError) as e:
-                    print(f"[ERROR] Could not parse camera index: {e}")
+            # Kamera wurde ausgewählt (Index beim Befüllen als Item-Daten gespeichert)
+            camera_index = item.data(0, _CAMERA_INDEX_ROLE)
+            if camera_index is not None:
+                # Schließe alle anderen Äste (Resolution, FPS, Format)
+                self.resolution_item.setExpanded(False)
+                self.fps_item.setExpanded(False)
+                self.format_item.setExpanded(False)
+                print("[LOG] Collapsed all tree items (Resolution, FPS, Format)")
+                
+                if camera_index in self._ids_by_index:
+                    self.select_device(camera_index)
+                else:
+                    # Nicht im Cache: einmalig im Thread-Pool proben, danach auswählen
+                    print(f"[LOG] Probing camera {camera_index} in background")
+                    self._single_probe = CameraProbeWorker([camera_index])
+                    self._single_probe.probed.connect(self._on_single_probe_done)
+                    QThreadPool.globalInstance().start(self._single_probe.run)
                     
         elif item_type == "resolution":
             # Resolution wurde ausgewählt
@@ -268,14 +586,14 @@ class CalibrationDeviceWindow(QMainWindow):
                 self.update_fps_for_resolution(self.current_format, item_text)
             
             if self.current_camera_index is not None:
-                self.start_camera_with_settings()
+                self._restart_timer.start()
                 
         elif item_type == "fps":
             # FPS wurde ausgewählt
             self.current_fps = item_text
             print(f"[LOG] FPS changed to {item_text}")
             if self.current_camera_index is not None:
-                self.start_camera_with_settings()
+                self._restart_timer.start()
                 
         elif item_type == "format":
             # Format wurde ausgewählt
@@ -287,23 +605,35 @@ class CalibrationDeviceWindow(QMainWindow):
                 self.update_resolution_fps_for_format(item_text)
             
             if self.current_camera_index is not None:
-                self.start_camera_with_settings()
+                self._restart_timer.start()
     
     def populate_format_options(self, capabilities):
-        """Fülle TreeView mit tatsächlich unterstützten Optionen"""
-        # Lösche alte Format-Children
-        self.format_item.takeChildren()
-        
-        # Füge unterstützte Formate hinzu
-        for fmt in capabilities.keys():
-            fmt_child = QTreeWidgetItem(self.format_item, [fmt])
-            fmt_child.setData(0, Qt.UserRole, "format")
-            self.set_item_height(fmt_child)
-        
-        # Fülle Resolution und FPS für erstes Format
-        if capabilities:
-            first_format = list(capabilities.keys())[0]
-            self.update_resolution_fps_for_format(first_format)
+        """Fülle TreeView mit tatsächlich unterstützten Optionen.
+
+        Alle Resolution- und FPS-Items werden hier einmal pro Kamera erzeugt;
+        Format-/Resolution-Wechsel blenden sie danach nur noch ein/aus.
+        """
+        with self.tree_batch():
+            # Lösche alte Children
+            self.format_item.takeChildren()
+            self.resolution_item.takeChildren()
+            self.fps_item.takeChildren()
+            self._res_items = {}
+            self._fps_items = {}
+            
+            # Füge unterstützte Formate, Resolutions und FPS hinzu
+            self.add_children(self.format_item, list(capabilities.keys()), "format")
+            for fmt, resolutions in capabilities.items():
+                self._res_items[fmt] = self.add_children(self.resolution_item, list(resolutions.keys()),
+                                                         "resolution", hidden=True)
+                for res, fps_list in resolutions.items():
+                    self._fps_items[(fmt, res)] = self.add_children(self.fps_item, [str(fps) for fps in fps_list],
+                                                                    "fps", hidden=True)
+            
+            # Fülle Resolution und FPS für erstes Format
+            if capabilities:
+                first_format = list(capabilities.keys())[0]
+                self.update_resolution_fps_for_format(first_format)
     
     def update_resolution_fps_for_format(self, selected_format):
         """Update Resolution und FPS basierend auf gewähltem Format"""
@@ -314,24 +644,21 @@ class CalibrationDeviceWindow(QMainWindow):
         if selected_format not in capabilities:
             return
         
-        # Lösche alte Resolution-Children
-        self.resolution_item.takeChildren()
-        
-        # Füge unterstützte Resolutions für dieses Format hinzu
-        resolutions = capabilities[selected_format]
-        for res in resolutions.keys():
-            res_child = QTreeWidgetItem(self.resolution_item, [res])
-            res_child.setData(0, Qt.UserRole, "resolution")
-            self.set_item_height(res_child)
-        
-        # Update FPS für erste Resolution
-        if resolutions:
-            first_resolution = list(resolutions.keys())[0]
-            self.update_fps_for_resolution(selected_format, first_resolution)
+        with self.tree_batch():
+            # Nur die Resolutions dieses Formats anzeigen
+            for fmt, items in self._res_items.items():
+                for res_child in items:
+                    res_child.setHidden(fmt != selected_format)
             
-            # Setze current_resolution falls noch nicht gesetzt
-            if not hasattr(self, 'current_resolution') or self.current_resolution not in resolutions:
-                self.current_resolution = first_resolution
+            # Update FPS für erste Resolution
+            resolutions = capabilities[selected_format]
+            if resolutions:
+                first_resolution = list(resolutions.keys())[0]
+                self.update_fps_for_resolution(selected_format, first_resolution)
+                
+                # Setze current_resolution falls noch nicht gesetzt
+                if not hasattr(self, 'current_resolution') or self.current_resolution not in resolutions:
+                    self.current_resolution = first_resolution
     
     def update_fps_for_resolution(self, selected_format, selected_resolution):
         """Update FPS basierend auf Format und Resolution"""
@@ -344,22 +671,18 @@ class CalibrationDeviceWindow(QMainWindow):
         if selected_resolution not in capabilities[selected_format]:
             return
         
-        # Lösche alte FPS-Children
-        self.fps_item.takeChildren()
-        
-        # Füge unterstützte FPS für diese Kombination hinzu
-        fps_list = capabilities[selected_format][selected_resolution]
-        for fps in fps_list:
-            fps_child = QTreeWidgetItem(self.fps_item, [str(fps)])
-            fps_child.setData(0, Qt.UserRole, "fps")
-            self.set_item_height(fps_child)
+        with self.tree_batch():
+            # Nur die FPS dieser Kombination anzeigen
+            selected = (selected_format, selected_resolution)
+            for key, items in self._fps_items.items():
+                for fps_child in items:
+                    fps_child.setHidden(key != selected)
         
         # Setze current_fps falls noch nicht gesetzt
+        fps_list = capabilities[selected_format][selected_resolution]
         if fps_list and (not hasattr(self, 'current_fps') or int(self.current_fps) not in fps_list):
             self.current_fps = str(fps_list[0])
     
-    
-        
     def setup_connections(self):
         """Verbinde UI-Elemente mit Logik"""
         self.ui.bCancel.clicked.connect(self.on_cancel_clicked)
@@ -368,84 +691,115 @@ class CalibrationDeviceWindow(QMainWindow):
     
     def set_item_height(self, item):
         """Setze feste Höhe für TreeWidget Item"""
-        from PyQt5.QtCore import QSize
-        item.setSizeHint(0, QSize(0, 44))
+        item.setSizeHint(0, self._ROW_SIZE_HINT)
+
+    @contextmanager
+    def tree_batch(self):
+        """Sammle TreeView-Änderungen: keine Repaints/Signale bis zum Ende des Blocks"""
+        tree = self.ui.tvSettings
+        was_enabled = tree.updatesEnabled()
+        was_blocked = tree.blockSignals(True)
+        tree.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            tree.setUpdatesEnabled(was_enabled)
+            tree.blockSignals(was_blocked)
+            if was_enabled:
+                tree.viewport().update()
 
-    def get_human_readable_cameras(self):
-        devices = camera.list_video_devices()
-        available = [f"Camera {i} (/dev/video{i})" for i in devices]
+    def add_children(self, parent, texts, item_type, hidden=False):
+        """Hänge Child-Items in einem Rutsch an (addChildren statt einzelner Inserts).
+
+        Die 44px-Zeilenhöhe (Touchscreen) wird vor dem Einhängen gesetzt, das löst
+        noch kein Layout aus.
+        """
+        children = []
+        for text in texts:
+            child = QTreeWidgetItem([text])
+            if item_type is not None:
+                child.setData(0, Qt.UserRole, item_type)  # Tag für Identifikation
+            self.set_item_height(child)
+            children.append(child)
+        parent.addChildren(children)
+        if hidden:
+            for child in children:
+                child.setHidden(True)
+        return children
+
+    def get_human_readable_cameras(self, devices=None):
+        if devices is None:
+            devices = self._devices
+        # Cache wird beim Probing bzw. bei /dev-Änderungen verworfen
+        key = tuple(devices)
+        if self._cameras_cache is not None and self._cameras_cache[0] == key:
+            return list(self._cameras_cache[1])
+        available = [(i, f"Camera {i} (/dev/video{i})") for i in devices]
         if not available:
-            available.append("No cameras detected")
-        return available
+            available.append((None, "No cameras detected"))
+        self._cameras_cache = (key, available)
+        return list(available)
+    
+    def populate_device_items(self, devices):
+        """Fülle den Device-Ast mit den gefundenen Kameras"""
+        with self.tree_batch():
+            self.device_item.takeChildren()
+            cameras = self.get_human_readable_cameras(devices)
+            children = self.add_children(self.device_item, [name for _, name in cameras], "device")
+            for child, (camera_index, _) in zip(children, cameras):
+                if camera_index is not None:
+                    child.setData(0, _CAMERA_INDEX_ROLE, camera_index)
     
     def setup_tree_view(self):
         """Erzeuge und fülle die TreeView mit Standard-Items"""
-        # Clear existing items
-        self.ui.tvSettings.clear()
-
-        # Styling wird jetzt über styles.qss gesteuert
-
-        # Setze Item-Höhe einheitlich
-        self.ui.tvSettings.setUniformRowHeights(True)
-
-        # Aktiviere Expand on Click für Parent-Items
-        self.ui.tvSettings.setExpandsOnDoubleClick(False)  # Nicht bei Doppelklick
-
-        # Device (Camera) - am Anfang expanded
-        self.device_item = QTreeWidgetItem(self.ui.tvSettings, ["📷 Device"])
-        self.device_item.setExpanded(True)
-        self.set_item_height(self.device_item)
-
-        # Lade verfügbare Kameras
-        cameras = self.get_human_readable_cameras()
-        for camera_name in cameras:
-            camera_child = QTreeWidgetItem(self.device_item, [camera_name])
-            camera_child.setData(0, Qt.UserRole, "device")  # Tag für Identifikation
-            self.set_item_height(camera_child)
-
-        # Resolution - am Anfang collapsed und disabled
-        self.resolution_item = QTreeWidgetItem(self.ui.tvSettings, ["📐 Resolution"])
-        self.resolution_item.setExpanded(False)
-        self.resolution_item.setDisabled(True)
-        self.set_item_height(self.resolution_item)
-        resolutions = ["640x480", "800x600", "1280x720", "1920x1080"]
-        for res in resolutions:
-            res_child = QTreeWidgetItem(self.resolution_item, [res])
-            res_child.setData(0, Qt.UserRole, "resolution")
-            self.set_item_height(res_child)
-
-        # FPS - am Anfang collapsed und disabled
-        self.fps_item = QTreeWidgetItem(self.ui.tvSettings, ["🎬 FPS"])
-        self.fps_item.setExpanded(False)
-        self.fps_item.setDisabled(True)
-        self.set_item_height(self.fps_item)
-        fps_options = ["15", "30", "60"]
-        for fps in fps_options:
-            fps_child = QTreeWidgetItem(self.fps_item, [fps])
-            fps_child.setData(0, Qt.UserRole, "fps")
-            self.set_item_height(fps_child)
-
-        # Format - am Anfang collapsed und disabled
-        self.format_item = QTreeWidgetItem(self.ui.tvSettings, ["🎨 Format"])
-        self.format_item.setExpanded(False)
-        self.format_item.setDisabled(True)
-        self.set_item_height(self.format_item)
-        formats = ["MJPEG", "YUYV", "H264"]
-        for fmt in formats:
-            fmt_child = QTreeWidgetItem(self.format_item, [fmt])
-            fmt_child.setData(0, Qt.UserRole, "format")
-            self.set_item_height(fmt_child)
+        with self.tree_batch():
+            # Clear existing items
+            self.ui.tvSettings.clear()
+
+            # Styling wird jetzt über styles.qss gesteuert
+
+            # Setze Item-Höhe einheitlich
+            self.ui.tvSettings.setUniformRowHeights(True)
+
+            # Aktiviere Expand on Click für Parent-Items
+            self.ui.tvSettings.setExpandsOnDoubleClick(False)  # Nicht bei Doppelklick
+
+            # Device (Camera) - am Anfang expanded
+            self.device_item = QTreeWidgetItem(self.ui.tvSettings, ["📷 Device"])
+            self.device_item.setExpanded(True)
+            self.set_item_height(self.device_item)
+
+            # Lade verfügbare Kameras (Platzhalter bis das Probing fertig ist)
+            if self._probe_result is not None:
+                self.populate_device_items(self._devices)
+            else:
+                self.add_children(self.device_item, ["Searching cameras..."], None)
+
+            # Resolution - am Anfang collapsed und disabled
+            self.resolution_item = QTreeWidgetItem(self.ui.tvSettings, ["📐 Resolution"])
+            self.resolution_item.setExpanded(False)
+            self.resolution_item.setDisabled(True)
+            self.set_item_height(self.resolution_item)
+            self.add_children(self.resolution_item, ["640x480", "800x600", "1280x720", "1920x1080"], "resolution")
+
+            # FPS - am Anfang collapsed und disabled
+            self.fps_item = QTreeWidgetItem(self.ui.tvSettings, ["🎬 FPS"])
+            self.fps_item.setExpanded(False)
+            self.fps_item.setDisabled(True)
+            self.set_item_height(self.fps_item)
+            self.add_children(self.fps_item, ["15", "30", "60"], "fps")
+
+            # Format - am Anfang collapsed und disabled
+            self.format_item = QTreeWidgetItem(self.ui.tvSettings, ["🎨 Format"])
+            self.format_item.setExpanded(False)
+            self.format_item.setDisabled(True)
+            self.set_item_height(self.format_item)
+            self.add_children(self.format_item, ["MJPEG", "YUYV", "H264"], "format")
 
         print("[LOG] TreeView setup complete")
         
     
     
-    def get_default_capabilities(self):
-        """Throw error and prompt user to install v4l2-ctl if not available."""
-        raise RuntimeError(
-            "Camera capabilities could not be determined. Please install 'v4l2-ctl' (sudo apt install v4l-utils) and ensure your camera is connected."
-        )
-        
     # load_cameras() removed: ComboBox-based UI is deprecated in favor of TreeView.
         
     # populate_default_settings() removed: UI uses TreeView; ComboBox defaults are unused.
@@ -471,38 +825,61 @@ class CalibrationDeviceWindow(QMainWindow):
             fps = 30
             print(f"[ERROR] Invalid FPS, using default")
         
-        # Format zu FOURCC Code
-        format_fourcc = None
-        if self.current_format == 'MJPG':
-            format_fourcc = cv2.VideoWriter_fourcc(*'MJPG')
-        elif self.current_format == 'YUYV':
-            format_fourcc = cv2.VideoWriter_fourcc(*'YUYV')
-        elif self.current_format == 'H264':
-            format_fourcc = cv2.VideoWriter_fourcc(*'H264')
+        # Format zu FOURCC Code ("MJPEG" aus Settings/TreeView -> MJPG)
+        format_fourcc = camera.format_to_fourcc(self.current_format)
         
-        print(f"[LOG] Starting camera {self.current_camera_index} with {width}x{height} @ {fps}fps ({self.current_format})")
+        # Unveränderte Konfiguration nicht erneut öffnen
+        cfg = (self.current_camera_index, width, height, fps, format_fourcc)
+        if cfg == self._last_cfg_tuple and self.video_thread is not None:
+            return
+        self._last_cfg_tuple = cfg
         
-        # Stoppe vorherige Kamera falls aktiv
-        self.stop_camera()
+        print(f"[LOG] Starting camera {self.current_camera_index} with {width}x{height} @ {fps}fps ({self.current_format})")
         
-        # Erstelle und starte Video Thread mit Einstellungen
-        self.video_thread = camera.VideoThread(self.current_camera_index, width, height, fps, format_fourcc)
-        self.video_thread.change_pixmap_signal.connect(self.update_image)
+        # Laufende Pipeline umkonfigurieren (öffnet die Kamera im Thread neu, kein join im GUI-Thread)
+        if self.video_thread is None:
+            self.start_video_pipeline()
+        # Vorschau: ein Capture-Buffer, damit immer der aktuellste Frame angezeigt wird;
+        # erst bei hohen Frameraten mehr Buffer, damit GC-Pausen keine Frames kosten
+        buffer_count = 4 if fps >= 60 else 1
+        self.video_thread.configure(self.current_camera_index, width, height, fps, format_fourcc,
+                                    buffer_count=buffer_count)
+    
+    def start_video_pipeline(self):
+        """Starte den langlebigen Capture-Thread (wartet bis zur ersten Konfiguration)"""
+        screen = QApplication.primaryScreen()
+        display_hz = screen.refreshRate() if screen is not None else None
+        # Farbvorschau: hier wird das Kameraformat gewählt, der Benutzer soll das echte Bild sehen
+        # (Graustufen bleiben ein explizites Opt-in von VideoThread)
+        self.video_thread = camera.VideoPipeline(display_size=self.camera_view_size,
+                                                 display_hz=display_hz)
+        # Queued: das QImage teilt sich den Puffer (2. Argument) mit dem Thread, es wird nicht kopiert
+        self.video_thread.change_pixmap_signal.connect(self.update_image, Qt.QueuedConnection)
+        self.video_thread.open_failed.connect(self._on_camera_open_failed)
         self.video_thread.start()
     
     def stop_camera(self):
         """Stoppe Kamera-Stream"""
+        # Keinen ausstehenden Neustart mehr ausführen
+        self._restart_timer.stop()
         if self.video_thread is not None:
-            self.video_thread.stop()
-            devices = camera.list_video_devices()
+            # Keine Frames mehr an die (evtl. schon verdeckte) View liefern
+            thread = self.video_thread
+            thread.blockSignals(True)
+            # Nicht im GUI-Thread joinen: Kamera-Release kann bis zu einem Frame dauern
+            thread.stop(wait=False)
+            _STOPPING_THREADS.add(thread)
+            QThreadPool.globalInstance().start(lambda t=thread: _join_stopped_thread(t))
+            self.video_thread = None
+            self._last_cfg_tuple = None
             print("[LOG] Camera stopped")
             
-    def update_image(self, qt_image):
-        pixmap = QPixmap.fromImage(qt_image)
-        self.pixmap_item.setPixmap(pixmap)
-        # Fit in View beim ersten Frame
-        if self.scene.sceneRect().isEmpty():
-            self.ui.gvCamera.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+    def update_image(self, qt_image, frame):
+        # Verdeckte View nicht neu zeichnen
+        if not self.ui.gvCamera.isVisible():
+            return
+        # Puffer mitspeichern: FrameItem zeichnet das QImage bei jedem Expose erneut
+        self.frame_item.set_image(qt_image, frame)
 
     def on_cancel_clicked(self):
         """bCancel: Verwerfe temporäre Auswahl, stelle vorherige wieder her"""
@@ -521,23 +898,33 @@ class CalibrationDeviceWindow(QMainWindow):
         print("[LOG] OK button pressed - applying changes")
         # Übernimm die aktuelle Auswahl global
         if self.current_camera_index is not None and self.current_camera_id is not None:
-            appSettings.set_active_camera(self.current_camera_index, self.current_camera_id)
+            # active_camera wird zusammen mit den Kamera-Settings in einem Schreibvorgang gespeichert
+            appSettings.set_active_camera(self.current_camera_index, self.current_camera_id, persist=False)
             print(f"[LOG] Applied camera selection globally: index={self.current_camera_index}, id={self.current_camera_id}")
             # Speichere Kamera-Settings (inkl. ausgewählte Kamera)
             self.save_current_camera_settings()
-            # active_camera is now persisted via set_selected_camera; no legacy selected_camera entry
+            # active_camera is persisted via save_current_camera_settings; no legacy selected_camera entry
         # Stoppe Kamera vor dem Verlassen
         self.stop_camera()
         if self.on_exit_callback:
             self.on_exit_callback()
 
     def save_current_camera_settings(self):
-        """Delegate camera settings save to appSettings.save_current_camera_settings."""
-        appSettings.save_current_camera_settings(
+        """Übernimm die Kamera-Settings und schreibe sie im Hintergrund (_SettingsWriter)."""
+        if appSettings.update_current_camera_settings(
             self.saved_settings,
             self.current_camera_id,
             self.current_camera_index,
             self.current_format,
             self.current_resolution,
             self.current_fps
-        )
+        ):
+            settings_writer().enqueue(self.saved_settings)
+            print(f"[LOG] Queued settings save for camera {self.current_camera_id}")
+
+    def closeEvent(self, event):
+        """Beim Schließen Kamera stoppen und ausstehende Settings auf die Platte bringen"""
+        self.stop_camera()
+        wait_for_stopped_threads()
+        settings_writer().flush()
+        super().closeEvent(event)
@@ -6,13 +6,19 @@ Calibration Distortion Window Logik
 """
 
 import os
+import sys
+import queue
+import multiprocessing
+import multiprocessing.forkserver
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 import rectifyHelper
 import json
 import icons_rc  # Qt Resource File für Icons
-from PyQt5.QtWidgets import QWidget, QDialogButtonBox, QGraphicsScene, QApplication
-from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QDialogButtonBox, QGraphicsScene, QGraphicsPixmapItem, QApplication
+from PyQt5.QtCore import QTimer, Qt, QObject, QThreadPool, QRunnable, pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap
 from caliDistortionWin import Ui_Form as Ui_CalibrationDistortionWindow
 from caliDialog import Ui_CalibrationDialog
@@ -20,45 +26,171 @@ import appSettings
 import camera
 
 
-class ProcessingThread(QThread):
-    """Hintergrund-Thread für Foto-Verarbeitung"""
+# Qt >= 5.14 kann BGR-Frames direkt anzeigen (spart cvtColor BGR->RGB pro Frame)
+_QIMAGE_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+# Kalibrierungs-Prozesse kommen aus einem Forkserver: der Server ist ein frischer Prozess
+# ohne Qt-Threads (fork ist dort sicher) und lädt cv2/PyQt nur einmal vor, statt wie bei
+# spawn bei jeder Kalibrierung neu (cv2 allein dauert auf dem Pi Sekunden).
+# Das Startskript wird unter seinem Modulnamen vorgeladen ('__main__' ignoriert der
+# Forkserver in Python 3.11); der Kindprozess führt dann nur noch dessen Rumpf aus.
+_MP_CONTEXT = multiprocessing.get_context('forkserver')
+_MAIN_FILE = getattr(sys.modules['__main__'], '__file__', None)
+_MP_CONTEXT.set_forkserver_preload(
+    ['rectifyHelper'] + ([os.path.splitext(os.path.basename(_MAIN_FILE))[0]] if _MAIN_FILE else []))
+
+# JPEG-Qualität der Kalibrierungs-Samples
+SAMPLE_JPEG_QUALITY = 85
+# Wegwerf-Samples: kein Huffman-Optimieren, kein Progressive (schnelleres Encoding)
+_SAMPLE_JPEG_FLAGS = [cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+
+
+class _SaveJobSignals(QObject):
+    """Signale für _SaveJob (QRunnable ist kein QObject)"""
+    checked = pyqtSignal(int, bool)  # sample index, checkerboard found
+
+
+class _SaveJob(QRunnable):
+    """Prüft ein Sample auf ein Schachbrett und schreibt es im Hintergrund (nicht im GUI-Thread).
+
+    Mit checkerboard_size wird nur geschrieben, wenn findChessboardCornersSB
+    das Muster findet; das Ergebnis kommt über signals.checked zurück.
+    """
+    
+    def __init__(self, frame, filepath, quality=SAMPLE_JPEG_QUALITY, checkerboard_size=None, index=0):
+        super().__init__()
+        self.frame = frame
+        self.filepath = filepath
+        self.quality = quality
+        self.checkerboard_size = checkerboard_size
+        self.index = index
+        self.signals = _SaveJobSignals()
+        
+    def run(self):
+        found = True
+        if self.checkerboard_size is not None:
+            gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+            found, _ = cv2.findChessboardCornersSB(gray, self.checkerboard_size,
+                                                   flags=cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_EXHAUSTIVE)
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality] + _SAMPLE_JPEG_FLAGS
+        if found and not cv2.imwrite(self.filepath, self.frame, params):
+            print(f"[ERROR] Failed to write {self.filepath}")
+        self.signals.checked.emit(self.index, bool(found))
+
+
+def _remove_sample(filepath):
+    """Lösche eine Sample-Datei (best effort, für den Cleanup-Thread-Pool)"""
+    try:
+        os.unlink(filepath)
+        print(f"[LOG] Removed old sample: {os.path.basename(filepath)}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[ERROR] Failed to remove {filepath}: {e}")
+
+
+class ProcessingThread(QObject):
+    """Kalibrierung in einem eigenen Prozess (eigener CPU-Kern, keine Konkurrenz mit der Event-Loop).
+
+    Name und Signale wie beim früheren QThread. Das Ergebnis kommt über eine
+    multiprocessing.Queue zurück, die per QTimer alle 200 ms abgefragt wird.
+    """
     progress_updated = pyqtSignal(str)  # Text für Progress-Label
     processing_complete = pyqtSignal(bool, object, object, object, object, int)  # success, camera_matrix, dist_coeffs, error, detected_size, successful_count
     
-    def __init__(self, sample_dir, max_samples, checkerboard_sizes, detected_size, square_size):
-        super().__init__()
+    POLL_INTERVAL_MS = 200
+    
+    def __init__(self, sample_dir, max_samples, checkerboard_sizes, detected_size, square_size, io_pool=None, parent=None,
+                 shared_frames=None, objp=None):
+        super().__init__(parent)
+        # Vorberechnete Objektpunkte (rectifyHelper.make_object_points)
+        self.objp = objp
+        # Aufgenommene Frames im Shared Memory (shm_name, ring_shape, count), der Prozess liest sie
+        # direkt aus dem Block; ohne shared_frames werden die Sample-Dateien gelesen
+        self.shared_frames = shared_frames
+        # Pool mit ausstehenden Sample-Schreibvorgängen; ohne shared_frames startet der Prozess erst, wenn er leer ist
+        self.io_pool = io_pool
         self.sample_dir = sample_dir
         self.max_samples = max_samples
         self.checkerboard_sizes = checkerboard_sizes
         self.detected_checkerboard_size = detected_size
         self.square_size = square_size
-        
-    def run(self):
-        """Verarbeite Fotos im Hintergrund (refactored to use rectificationHelper)."""
+        # Forkserver statt fork: ein geforkter Qt-Prozess mit laufenden Threads kann hängen bleiben
+        self._ctx = _MP_CONTEXT
+        self._process = None
+        self._result_q = None
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._poll)
+        
+    def start(self):
+        """Starte die Verarbeitung (kehrt sofort zurück)"""
+        self._poll_timer.start()
+        self._poll()
+        
+    def isRunning(self):
+        return self._poll_timer.isActive()
+        
+    def stop(self):
+        """Breche eine laufende Verarbeitung ab"""
+        self._poll_timer.stop()
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._process = None
+        
+    def _launch(self):
+        self.progress_updated.emit("Processing calibration samples...")
+        self._result_q = self._ctx.Queue()
+        if self.shared_frames is not None:
+            func = rectifyHelper.calibrate_camera_from_shared_frames
+            source = self.shared_frames
+        else:
+            func = rectifyHelper.calibrate_camera_from_samples
+            source = self.sample_dir
+        args = (source, self.max_samples, self.checkerboard_sizes,
+                self.detected_checkerboard_size, self.square_size)
+        self._process = self._ctx.Process(target=rectifyHelper.calibrate_camera_worker,
+                                          args=(func, args, self._result_q, {'objp': self.objp}), daemon=True)
+        self._process.start()
+        
+    def _poll(self):
+        if self._process is None:
+            if self.shared_frames is None and self.io_pool is not None and self.io_pool.activeThreadCount() > 0:
+                return  # Samples werden noch geschrieben
+            self._launch()
+            return
         try:
-            self.progress_updated.emit("Processing calibration samples...")
-            result = rectifyHelper.calibrate_camera_from_samples(
-                self.sample_dir,
-                self.max_samples,
-                self.checkerboard_sizes,
-                self.detected_checkerboard_size,
-                self.square_size
-            )
-            success, camera_matrix, dist_coeffs, mean_error, detected_size, successful_count = result
-            if not success:
-                error_text = f"Error: Only {successful_count}/{self.max_samples} photos contain valid checkerboards.\n\n"
-                error_text += "At least 3 photos with checkerboards are required for calibration.\n\n"
-                error_text += "Please cancel and try again with better focus and lighting."
-                self.progress_updated.emit(error_text)
-                self.processing_complete.emit(False, None, None, None, None, successful_count)
+            # Ist der Prozess schon beendet, kurz auf die letzten Daten aus der Pipe warten
+            if self._process.is_alive():
+                status, payload = self._result_q.get_nowait()
+            else:
+                status, payload = self._result_q.get(timeout=0.5)
+        except queue.Empty:
+            if self._process.is_alive():
                 return
-            self.processing_complete.emit(True, camera_matrix, dist_coeffs, mean_error, detected_size, successful_count)
-        except Exception as e:
-            print(f"[ERROR] Processing failed: {e}")
-            import traceback
-            traceback.print_exc()
-            self.progress_updated.emit(f"Error during processing:\n{str(e)}")
+            status, payload = 'error', f"calibration process exited with code {self._process.exitcode}"
+        self._poll_timer.stop()
+        self._process.join()
+        self._process = None
+        self._handle_result(status, payload)
+        
+    def _handle_result(self, status, payload):
+        """Ergebnis des Kalibrierungs-Prozesses in die bisherigen Signale übersetzen"""
+        if status != 'ok':
+            print(f"[ERROR] Processing failed: {payload}")
+            self.progress_updated.emit(f"Error during processing:\n{payload}")
             self.processing_complete.emit(False, None, None, None, None, 0)
+            return
+        success, camera_matrix, dist_coeffs, mean_error, detected_size, successful_count = payload
+        if not success:
+            error_text = f"Error: Only {successful_count}/{self.max_samples} photos contain valid checkerboards.\n\n"
+            error_text += "At least 3 photos with checkerboards are required for calibration.\n\n"
+            error_text += "Please cancel and try again with better focus and lighting."
+            self.progress_updated.emit(error_text)
+            self.processing_complete.emit(False, None, None, None, None, successful_count)
+            return
+        self.processing_complete.emit(True, camera_matrix, dist_coeffs, mean_error, detected_size, successful_count)
 
 
 class CalibrationDistortionWindow(QWidget):
@@ -88,6 +220,24 @@ class CalibrationDistortionWindow(QWidget):
         self.sample_dir = rectifyHelper.get_sample_dir()
         self.max_samples = 15
         self.current_sample = 0
+        # Hintergrund-Pool für das Speichern der Samples
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(2)
+        # Forkserver schon jetzt starten: das Vorladen läuft, während die Samples aufgenommen werden
+        multiprocessing.forkserver.ensure_running()
+        # In dieser Sitzung geschriebene Samples (Cleanup ohne Verzeichnis-Scan);
+        # None: Verzeichnis noch nicht bereinigt, evtl. Reste eines früheren Laufs
+        self._written_samples = None
+        # Aufgenommene Frames für die Kalibrierung (kein erneutes Lesen/Decodieren der JPEGs):
+        # ein Ring (max_samples, H, W, 3) in einem Shared-Memory-Block, den der Kalibrierungs-Prozess
+        # ohne Kopie liest; beim ersten Sample bzw. bei neuer Frame-Größe angelegt.
+        # Slot i gehört zu Sample i+1, gültig sind die ersten current_sample Einträge
+        self._sample_ring = None
+        self._sample_shm = None
+        # Sample, dessen Schachbrett-Prüfung noch läuft: (index, frame, filepath, signals)
+        self._pending_check = None
+        # Zuletzt von update_frame gelesenes Vollbild
+        self._last_frame = None
 
         # Ensure sample directory exists
         rectifyHelper.ensure_sample_dir(self.sample_dir)
@@ -99,12 +249,15 @@ class CalibrationDistortionWindow(QWidget):
         print(f"  Square size: {self.square_size}mm")
 
         self.checkerboard_sizes = [self.checkerboard_size]
+        # Objektpunkte des Schachbretts einmal vorberechnen und an die Kalibrierung übergeben
+        self._objp = rectifyHelper.make_object_points(self.checkerboard_size, self.square_size)
         self.detected_checkerboard_size = None  # Set on first successful image
 
         # Calibration results
         self.camera_matrix = None
         self.dist_coeffs = None
         self.calibration_error = None
+        self.processing_thread = None
         
         # Status-Tracking für Button-Farbe
         self.detection_timer = QTimer(self)
@@ -134,15 +287,22 @@ class CalibrationDistortionWindow(QWidget):
         
     def cleanup_sample_directory(self):
         """Lösche alle vorhandenen Sample-Bilder"""
-        if os.path.exists(self.sample_dir):
-            for filename in os.listdir(self.sample_dir):
-                if filename.endswith('.jpg') or filename.endswith('.png'):
-                    filepath = os.path.join(self.sample_dir, filename)
-                    try:
-                        os.remove(filepath)
-                        print(f"[LOG] Removed old sample: {filename}")
-                    except Exception as e:
-                        print(f"[ERROR] Failed to remove {filename}: {e}")
+        # Ausstehende Schreibvorgänge abwarten, damit keine Datei nach dem Löschen entsteht
+        self._io_pool.waitForDone()
+        if self._written_samples is not None:
+            paths = self._written_samples
+        else:
+            # Erster Cleanup: Reste früherer Läufe per scandir finden (DirEntry liefert den Pfad direkt)
+            try:
+                with os.scandir(self.sample_dir) as entries:
+                    paths = [entry.path for entry in entries if entry.name.endswith(('.jpg', '.png'))]
+            except FileNotFoundError:
+                paths = []
+        if paths:
+            # Mehrere unlinks gleichzeitig: überlappt die Latenz der SD-Karte
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(_remove_sample, paths))
+        self._written_samples = []
         
     def setup_ui(self):
         """Initialisiere UI-Elemente"""
@@ -158,6 +318,16 @@ class CalibrationDistortionWindow(QWidget):
         self.scene = QGraphicsScene()
         self.ui.gvCamera.setScene(self.scene)
         
+        # Ein dauerhaftes Pixmap-Item, dessen Pixmap pro Frame ausgetauscht wird (kein scene.clear())
+        self._pix_item = QGraphicsPixmapItem()
+        self.scene.addItem(self._pix_item)
+        # Anzeige-Puffer (in Anzeigegröße, BGR oder RGB) und QImage darauf; beim ersten Frame
+        # bzw. bei Größenänderung angelegt
+        self._view_buf = None
+        self._qimg = None
+        # Größe der GraphicsView; Frames werden schon mit OpenCV auf diese Größe gebracht
+        self._view_size = (self.ui.gvCamera.width(), self.ui.gvCamera.height())
+        
         # Deaktiviere Scrollbars
         self.ui.gvCamera.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.ui.gvCamera.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -196,29 +366,57 @@ class CalibrationDistortionWindow(QWidget):
         self.ui.bSample.clicked.connect(self.on_sample_clicked)
         self.ui.bUndo.clicked.connect(self.on_undo_clicked)
         
+    def resizeEvent(self, event):
+        """Merke neue Größe der GraphicsView für die Vorschau-Skalierung"""
+        super().resizeEvent(event)
+        if hasattr(self, '_view_size'):
+            self._view_size = (self.ui.gvCamera.width(), self.ui.gvCamera.height())
+    
+    def _preview_size(self, w, h):
+        """Zielgröße der Vorschau: in die View eingepasst (Seitenverhältnis bleibt), nie vergrößert"""
+        view_w, view_h = self._view_size
+        scale = min(view_w / w, view_h / h, 1.0)
+        return max(1, int(w * scale)), max(1, int(h * scale))
+    
     def update_frame(self):
         """Aktualisiere Kamera-Bild"""
+        # Nicht sichtbar (minimiert/verdeckt): kein Lesen, Konvertieren, Skalieren
+        if not self.isVisible() or self.visibleRegion().isEmpty():
+            return
         if self.camera is None or not self.camera.is_opened():
             return
             
         ret, frame = self.camera.read()
         if not ret or frame is None:
             return
+        # Letztes Vollbild für on_sample_clicked merken (read() liefert jedes Mal ein neues Array)
+        self._last_frame = frame
+        
+        # Vorschau und Samples kommen aus demselben Vollbild: die UVC-Kameras laufen über V4L2
+        # ohne ISP, einen zweiten (lores) Stream wie bei libcamera/picamera2 gibt es hier nicht
+        h, w, ch = frame.shape
+        target_w, target_h = self._preview_size(w, h)
+        
+        # Puffer nur bei geänderter Vorschau-Größe neu anlegen, das QImage bleibt auf dem Puffer
+        if self._view_buf is None or self._view_buf.shape != (target_h, target_w, ch):
+            self._view_buf = np.empty((target_h, target_w, ch), dtype=np.uint8)
+            qformat = _QIMAGE_BGR888 if _QIMAGE_BGR888 is not None else QImage.Format_RGB888
+            self._qimg = QImage(self._view_buf.data, target_w, target_h, ch * target_w, qformat)
+        
+        # Auf Anzeigegröße verkleinern (INTER_LINEAR nutzt auf ARM die NEON-Pfade von OpenCV);
+        # mit Format_BGR888 (Qt >= 5.14) direkt in den Puffer, sonst zusätzlich BGR -> RGB
+        if _QIMAGE_BGR888 is not None:
+            if (target_w, target_h) != (w, h):
+                cv2.resize(frame, (target_w, target_h), dst=self._view_buf, interpolation=cv2.INTER_LINEAR)
+            else:
+                np.copyto(self._view_buf, frame)
+        else:
+            if (target_w, target_h) != (w, h):
+                frame = cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._view_buf)
         
-        # Konvertiere BGR zu RGB für Anzeige
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Zeige Bild in GraphicsView
-        h, w, ch = frame_rgb.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        # Skaliere auf GraphicsView-Größe
-        scaled_pixmap = pixmap.scaled(self.ui.gvCamera.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        
-        self.scene.clear()
-        self.scene.addPixmap(scaled_pixmap)
+        # Bild hat bereits die Zielgröße: nur die Pixmap des Items austauschen
+        self._pix_item.setPixmap(QPixmap.fromImage(self._qimg))
         
     def update_sample_counter(self):
         """Aktualisiere Sample-Counter Anzeige"""
@@ -229,6 +427,9 @@ class CalibrationDistortionWindow(QWidget):
         if self.camera is None:
             print("[ERROR] No camera available")
             return
+        # Vorheriges Sample wird noch geprüft (vor dem Cleanup, das auf den Pool wartet)
+        if self._pending_check is not None:
+            return
         # Wenn Counter bei 0, lösche alte Samples (neue Session)
         if self.current_sample == 0:
             self.cleanup_sample_directory()
@@ -237,17 +438,47 @@ class CalibrationDistortionWindow(QWidget):
         if self.current_sample >= self.max_samples:
             print("[WARNING] All samples already collected!")
             return
-        # Capture aktuelles Frame über Camera-Klasse
-        ret, frame = self.camera.read() if hasattr(self.camera, 'read') else (False, None)
-        if not ret:
-            print("[ERROR] Failed to capture frame")
+        # Das zuletzt angezeigte Frame verwenden (kein zweites read()); ohne Vorschau direkt lesen
+        frame = self._last_frame
+        if frame is None:
+            ret, frame = self.camera.read() if hasattr(self.camera, 'read') else (False, None)
+            if not ret:
+                print("[ERROR] Failed to capture frame")
+                return
+        # Schachbrett-Prüfung und JPEG-Speicherung im Hintergrund; gezählt wird erst bei Erfolg
+        index = self.current_sample + 1
+        filepath = os.path.join(self.sample_dir, f"sample_{index:02d}.jpg")
+        job = _SaveJob(frame, filepath, checkerboard_size=tuple(self.checkerboard_size), index=index)
+        job.signals.checked.connect(self._on_sample_checked)
+        self._pending_check = (index, frame, filepath, job.signals)
+        self.ui.bSample.setEnabled(False)
+        # Kein Undo während der Prüfung: der Index des Samples steht schon fest
+        self.ui.bUndo.setEnabled(False)
+        self._io_pool.start(job)
+        print(f"[DEBUG] Checking photo {index}: shape {frame.shape}, dtype {frame.dtype}")
+        
+    def _on_sample_checked(self, index, found):
+        """Slot (GUI-Thread): Ergebnis der Schachbrett-Prüfung eines Samples"""
+        if self._pending_check is None or self._pending_check[0] != index:
             return
-        # Speichere Bild als JPG
-        filename = f"sample_{self.current_sample + 1:02d}.jpg"
-        filepath = os.path.join(self.sample_dir, filename)
-        cv2.imwrite(filepath, frame)
-        print(f"[DEBUG] Saved photo: {filepath}")
-        print(f"[DEBUG] Frame shape: {frame.shape}, dtype: {frame.dtype}")
+        _, frame, filepath, _ = self._pending_check
+        self._pending_check = None
+        self.ui.bSample.setEnabled(True)
+        self.ui.bUndo.setEnabled(self.current_sample > 0)
+        if not found:
+            # Nicht zählen, der Benutzer kann das Bild direkt neu aufnehmen
+            self.ui.bSample.setStyleSheet("QPushButton { background-color: red; }")
+            self.detection_timer.start(500)
+            print(f"[LOG] No checkerboard in photo {index}, please retake")
+            return
+        # Frame für die Kalibrierung in den Ring kopieren; das JPEG dient nur noch zur Kontrolle
+        if self._sample_ring is None or self._sample_ring.shape[1:] != frame.shape:
+            if self.current_sample > 0:
+                print(f"[ERROR] Frame size changed during the session ({frame.shape}), photo {index} discarded")
+                return
+            self._alloc_sample_ring((self.max_samples,) + frame.shape)
+        np.copyto(self._sample_ring[self.current_sample], frame)
+        self._written_samples.append(filepath)
         self.current_sample += 1
         self.update_sample_counter()
         # Aktiviere Undo-Button
@@ -256,12 +487,27 @@ class CalibrationDistortionWindow(QWidget):
         self.ui.bSample.setStyleSheet("QPushButton { background-color: green; }")
         self.detection_timer.start(500)  # Nach 500ms zurück zu blau
         
-        print(f"[LOG] Photo {self.current_sample}/{self.max_samples} saved: {filename}")
+        print(f"[LOG] Photo {self.current_sample}/{self.max_samples} saved: {os.path.basename(filepath)}")
         
         # Wenn alle Samples gesammelt, zeige Dialog
         if self.current_sample >= self.max_samples:
             self.show_processing_dialog()
     
+    def _alloc_sample_ring(self, shape):
+        """Lege den Sample-Ring (uint8, shape) in einem neuen Shared-Memory-Block an"""
+        self._release_sample_ring()
+        self._sample_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self._sample_ring = np.ndarray(shape, dtype=np.uint8, buffer=self._sample_shm.buf)
+        
+    def _release_sample_ring(self):
+        """Gib den Shared-Memory-Block des Sample-Rings frei"""
+        # Erst das Array loslassen, sonst schlägt close() mit BufferError fehl
+        self._sample_ring = None
+        if self._sample_shm is not None:
+            self._sample_shm.close()
+            self._sample_shm.unlink()
+            self._sample_shm = None
+    
     def on_processing_progress(self, message):
         """Update Progress-Label während Verarbeitung"""
         self.dialog_ui.lProgress.setText(message)
@@ -310,6 +556,10 @@ class CalibrationDistortionWindow(QWidget):
             
     def on_undo_clicked(self):
         """bUndo: Lösche letztes Foto"""
+        # Während ein Sample geprüft wird, ist Undo gesperrt; das JPEG eines gezählten
+        # Samples ist bereits geschrieben (der Job schreibt vor dem checked-Signal)
+        if self._pending_check is not None:
+            return
         if self.current_sample > 0:
             # Lösche letztes gespeichertes Foto
             filename = f"sample_{self.current_sample:02d}.jpg"
@@ -318,6 +568,8 @@ class CalibrationDistortionWindow(QWidget):
             if os.path.exists(filepath):
                 os.remove(filepath)
                 print(f"[LOG] Removed photo: {filename}")
+            if self._written_samples and self._written_samples[-1] == filepath:
+                self._written_samples.pop()
             
             self.current_sample -= 1
             self.update_sample_counter()
@@ -329,7 +581,7 @@ class CalibrationDistortionWindow(QWidget):
             print(f"[LOG] Now at {self.current_sample}/{self.max_samples}")
     
     def show_processing_dialog(self):
-        """Zeige Dialog sofort und starte Verarbeitung nach kurzer Verzögerung"""
+        """Zeige Dialog sofort und starte die Verarbeitung"""
         # Deaktiviere Buttons
         self.ui.bExit.setEnabled(False)
         self.ui.bSample.setEnabled(False)
@@ -347,18 +599,26 @@ class CalibrationDistortionWindow(QWidget):
         self.dialog_ui.bAccept.setEnabled(False)
         self.dialog_ui.bCancel.setEnabled(True)
         
-        # Starte Verarbeitung nach kurzer Verzögerung (damit Dialog sichtbar wird)
-        QTimer.singleShot(100, self.start_processing_thread)
+        # Start erst im nächsten Event-Loop-Durchlauf, damit der Dialog vorher gezeichnet wird
+        # (kein processEvents() im Slot: das würde weitere Klicks/Ergebnisse hier hineinlassen)
+        QTimer.singleShot(0, self.start_processing_thread)
     
     def start_processing_thread(self):
         """Starte den Verarbeitungs-Thread"""
+        # Inzwischen abgebrochen (Cancel vor dem verzögerten Start)
+        if self.dialog_widget.isHidden():
+            return
         # Starte Verarbeitung im Hintergrund-Thread
         self.processing_thread = ProcessingThread(
             self.sample_dir,
             self.max_samples,
             self.checkerboard_sizes,
             self.detected_checkerboard_size,
-            self.square_size
+            self.square_size,
+            io_pool=self._io_pool,
+            parent=self,
+            shared_frames=(self._sample_shm.name, self._sample_ring.shape, self.current_sample),
+            objp=self._objp
         )
         self.processing_thread.progress_updated.connect(self.on_processing_progress)
         self.processing_thread.processing_complete.connect(self.on_processing_complete)
@@ -392,6 +652,7 @@ class CalibrationDistortionWindow(QWidget):
         
         # Schließe Kamera
         self.cleanup_camera()
+        self._release_sample_ring()
         
         # Gehe zurück
         if self.on_back_callback:
@@ -402,6 +663,10 @@ class CalibrationDistortionWindow(QWidget):
         print("[LOG] Calibration cancelled, resetting...")
         print("[INFO] Sample photos kept in /home/flex/uis/sample/ for review")
         
+        # Laufende Kalibrierung abbrechen
+        if self.processing_thread is not None:
+            self.processing_thread.stop()
+        
         # Reset Daten (aber Fotos NICHT löschen!)
         self.current_sample = 0
         self.camera_matrix = None
@@ -427,6 +692,7 @@ class CalibrationDistortionWindow(QWidget):
         
         # Schließe Kamera
         self.cleanup_camera()
+        self._release_sample_ring()
         
         # Gehe zurück
         if hasattr(self, 'on_exit_callback') and self.on_exit_callback:
@@ -442,7 +708,22 @@ class CalibrationDistortionWindow(QWidget):
             self.camera.release()
             self.camera = None
             
+    def hideEvent(self, event):
+        """Video-Timer anhalten, solange das Fenster nicht angezeigt wird"""
+        if self.timer:
+            self.timer.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        """Video-Timer wieder starten (nicht während der Verarbeitung)"""
+        super().showEvent(event)
+        if self.timer and not self.timer.isActive() and self.dialog_widget.isHidden():
+            self.timer.start(33)
+
     def closeEvent(self, event):
         """Cleanup beim Schließen des Fensters"""
+        if self.processing_thread is not None:
+            self.processing_thread.stop()
         self.cleanup_camera()
+        self._release_sample_ring()
         event.accept()
@@ -6,7 +6,7 @@ Minimal Perspective Calibration GUI
 - bSample: changes icon on button press
 """
 
-from PyQt5.QtWidgets import QWidget, QApplication, QGraphicsScene, QDialog, QVBoxLayout
+from PyQt5.QtWidgets import QWidget, QApplication, QGraphicsScene, QGraphicsPixmapItem, QGraphicsView, QDialog, QVBoxLayout
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap, QIcon
 from caliOffsetWin import Ui_Form
@@ -14,13 +14,56 @@ from MarkerImageWidget import MarkerImageWidget
 import appSettings
 import camera
 import sys
+import time
+import logging
 import cv2
+import numpy as np
 from roundbutton import RoundedButton
 from caliDialog import Ui_CalibrationDialog
 from PyQt5.QtWidgets import QDialog
 import imageProcess 
 import markerHelper 
 
+logger = logging.getLogger(__name__)
+
+# Live view refresh interval (~30 FPS)
+FRAME_INTERVAL_MS = 33
+
+# Marker groups 0..3 (xt, xb, yl, yr): glyph colors, zoom while placing, label styles
+MARKER_GROUP_COLORS = ((255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0))
+MARKER_ZOOM = 4.0
+LABEL_STYLE_DONE = "QLabel { color: green; font-weight: bold; font-size: 16pt; }"
+LABEL_STYLE_OPEN = "QLabel { color: orange; font-weight: bold; font-size: 16pt; }"
+
+# Qt >= 5.14 can show BGR frames directly (saves the BGR->RGB cvtColor per frame)
+_QIMAGE_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+
+def _display_array(frame, dst=None):
+    """Return frame in the channel order the QImage expects.
+
+    With Format_BGR888 that is frame itself; otherwise frame is converted to
+    RGB into dst, which is (re)allocated only if missing or of another shape.
+    """
+    if _QIMAGE_BGR888 is not None:
+        return frame
+    if dst is None or dst.shape != frame.shape:
+        dst = np.empty_like(frame)
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
+    return dst
+
+
+def _wrap_qimage(arr):
+    """Wrap an array from _display_array in a QImage; the caller keeps arr alive (Qt does not copy)."""
+    h, w, ch = arr.shape
+    fmt = _QIMAGE_BGR888 if _QIMAGE_BGR888 is not None else QImage.Format_RGB888
+    return QImage(arr.data, w, h, arr.strides[0], fmt), arr
+
+
+def _bgr_to_qimage(frame, dst=None):
+    """Wrap a BGR uint8 frame in a QImage; the caller keeps the returned array alive (Qt does not copy)."""
+    return _wrap_qimage(_display_array(frame, dst))
+
 class CalibrationOffsetWindow(QWidget):
     def __init__(self, parent=None, on_back_callback=None) -> None:
         super().__init__(parent)
@@ -29,21 +72,67 @@ class CalibrationOffsetWindow(QWidget):
         self.ui = Ui_Form()
         self.ui.setupUi(self)
         self.scene = QGraphicsScene()
+        # Live view is a single pixmap: no BSP index, no item interaction,
+        # no painter save/restore or antialias margins per paint
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.ui.gvCamera.setScene(self.scene)
+        self.ui.gvCamera.setInteractive(False)
+        self.ui.gvCamera.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        # Let the GPU (VideoCore on the Pi) scale/compose the live view (same policy as caliDevice)
+        camera.setup_gl_viewport(self.ui.gvCamera)
+        # One persistent item for the live view; only its pixmap is swapped per frame
+        self._pix_item = QGraphicsPixmapItem()
+        # nearest-neighbour scaling is plenty for a live preview; the frozen
+        # image (MarkerImageWidget) keeps its own rendering
+        self._pix_item.setTransformationMode(Qt.FastTransformation)
+        self.scene.addItem(self._pix_item)
+        self._pix_size = None
+        self._last_frame = None
+        self._live_qimg = None
+        self._live_buf = None
+        self._rgb_buf = None
+        # Geometric calibration (see refresh_calibration) and the undistort
+        # remap tables built from it once per frame size (see _undistort)
+        self._K = None
+        self._D = None
+        self._undist_maps = None
+        self._undist_size = None
         self.marker_widget = None
         self.marker_id_counter = 0
         self.freeze_mode = False
         self.camera = camera.Camera()
+        # Self-rescheduling single shot: a slow tick delays the next one instead
+        # of letting timeouts queue up behind it (see _tick)
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self._live = False
+        self._busy = False
         self.on_continue_clicked_cnt=0
         self.mouse_press_event_active = True
+        # Marker placement state, initialised here so the mouse handler needs no hasattr
+        self.pending_marker = None
+        self.selected_marker_group = 0
+        self.marker_id_counters = {}
+        # Counter label per marker group
+        self._group_labels = {0: self.ui.lXt, 1: self.ui.lXb, 2: self.ui.lYl, 3: self.ui.lYr}
         self.active_camera_id = None
-        self.init_camera()
+        # Capture runs in its own thread; the timer only shows the newest frame.
+        # Live frames are shrunk to the screen size there, stills stay full size
+        screen = appSettings.get_hardware_settings().get('screen_size', {})
+        display_size = (int(screen.get('width', 640)), int(screen.get('height', 480)))
+        self._cam_thread = camera.CameraThread(self.camera, display_size=display_size)
+        self._shown_seq = -1
         self.sample_icon_state = False
-        self.timer.timeout.connect(self.update_camera_background)
-        self.timer.start(33)  # ~30 FPS
+        self.timer.timeout.connect(self._tick)
         self.setup_ui()
         self.setup_connections()
+        # Open the camera after the window had a chance to paint (V4L2 setup takes
+        # hundreds of ms on the Pi); a placeholder is shown until then
+        self._placeholder = self.scene.addSimpleText("Starting camera…")
+        self._placeholder.setBrush(Qt.white)
+        self.ui.bSample.setEnabled(False)
+        QTimer.singleShot(0, self._open_camera_async)
           # Load num_offset_marker from appSettings
         self.num_offset_marker = appSettings.get_calibration_settings().get('num_offset_marker', 4)
         # Extrinsic results (azimuth, tx, ty) available to whole class
@@ -53,18 +142,21 @@ class CalibrationOffsetWindow(QWidget):
         # Initialize per-group counters (group 0..3)
         self.marker_counters_by_group = {0: 0, 1: 0, 2: 0, 3: 0}
         # Initialize labels: map groups to UI labels
-        try:
-            self.ui.lXT.setText(f"0/{self.num_offset_marker}")
-            self.ui.lXB.setText(f"0/{self.num_offset_marker}")
-            self.ui.lYL.setText(f"0/{self.num_offset_marker}")
-            self.ui.lYR.setText(f"0/{self.num_offset_marker}")
-        except Exception:
-            pass
+        for label in self._group_labels.values():
+            label.setText(f"0/{self.num_offset_marker}")
 
     def setup_ui(self):
         # Ersetze Buttons durch RoundedButton mit echter runder Hit-Area
         # NICHT bExit - der ist im Layout und bleibt wie er ist
-        
+        # Keine Zwischen-Repaints beim Austauschen/Verstecken: einmal am Ende neu zeichnen
+        self.setUpdatesEnabled(False)
+        try:
+            self._replace_buttons()
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+
+    def _replace_buttons(self):
         # Zoom und Accept/Decline Buttons
         self.ui.bDecline = RoundedButton(icon_path=":/icons/undo.png", diameter=56, parent=self, old_button=self.ui.bDecline)
         self.ui.bAccept = RoundedButton(icon_path=":/icons/ok.png", diameter=56, parent=self, old_button=self.ui.bAccept)
@@ -82,15 +174,13 @@ class CalibrationOffsetWindow(QWidget):
         self.marker_buttons: list[RoundedButton] = [self.ui.bXT, self.ui.bXB, self.ui.bYL, self.ui.bYR]
 
 
+        # hide all overlay buttons and prepare marker button states in one pass
         for btn in self.marker_buttons:
             btn.setHidden(True)
-        self.ui.bAccept.setHidden(True)
-        self.ui.bDecline.setHidden(True)    
-        self.ui.bContinue.setHidden(True)
-        # prepare marker button states
-        for btn in self.marker_buttons:
             btn.setCheckable(True)
             btn.setChecked(False)
+        for btn in (self.ui.bAccept, self.ui.bDecline, self.ui.bContinue):
+            btn.setHidden(True)
 
 
     def setup_connections(self):
@@ -123,25 +213,83 @@ class CalibrationOffsetWindow(QWidget):
         else:
             self.active_camera_id = None
 
+    def _open_camera_async(self):
+        if self.camera is None:
+            # window was closed before the camera got opened
+            return
+        self.init_camera()
+        self.refresh_calibration()
+        if self._placeholder is not None:
+            self.scene.removeItem(self._placeholder)
+            self._placeholder = None
+        self.ui.bSample.setEnabled(True)
+        self._start_live_capture()
+
+    def _start_live_capture(self):
+        if self.camera and self.camera.is_opened() and not self._cam_thread.isRunning():
+            self._cam_thread.start()
+        self._live = True
+        if not self.timer.isActive():
+            self.timer.start(FRAME_INTERVAL_MS)
+
+    def _stop_live_capture(self):
+        # stop the thread before anyone else reads from the camera
+        self._live = False
+        if self.timer.isActive():
+            self.timer.stop()
+        if self._cam_thread.isRunning():
+            self._cam_thread.stop()
+
+    def _tick(self):
+        # re-entrancy guard (e.g. a nested event loop inside the update)
+        if self._busy:
+            return
+        self._busy = True
+        start = time.monotonic()
+        try:
+            self.update_camera_background()
+        finally:
+            self._busy = False
+        if self._live:
+            elapsed_ms = int((time.monotonic() - start) * 1000)
+            self.timer.start(max(0, FRAME_INTERVAL_MS - elapsed_ms))
+
     def update_camera_background(self):
-        if self.camera and hasattr(self.camera, 'read'):
-            ret, frame = self.camera.read()
-            if ret:
-                import cv2
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qt_image)
-                self.scene.clear()
-                self.scene.addPixmap(pixmap)
-                self.ui.gvCamera.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        if self._cam_thread.seq != self._shown_seq:
+            self._shown_seq = self._cam_thread.seq
+            frame = self._cam_thread.copy_latest(self._last_frame)
+            if frame is not None:
+                # old Qt: BGR->RGB into the same preallocated buffer every tick
+                display = _display_array(frame, self._rgb_buf)
+                if _QIMAGE_BGR888 is None:
+                    self._rgb_buf = display
+                # copy_latest (and the RGB conversion) refill the same buffer each tick,
+                # so the QImage wrapping it is built only once (again after a freeze or size change)
+                if display is not self._live_buf:
+                    # keep the buffer referenced while the QImage points into it
+                    self._live_qimg, self._live_buf = _wrap_qimage(display)
+                self._last_frame = frame
+                h, w = frame.shape[:2]
+                self._pix_item.setPixmap(QPixmap.fromImage(self._live_qimg))
+                # refit only when the frame size changes (resizeEvent handles view changes)
+                if self._pix_size != (w, h):
+                    self._pix_size = (w, h)
+                    self._fit_live_view()
         # Show active camera ID in window title
         if self.active_camera_id:
             self.setWindowTitle(f"Perspective Calibration - Active Camera: {self.active_camera_id}")
         else:
             self.setWindowTitle("Perspective Calibration - No Camera")
 
+    def _fit_live_view(self):
+        self.scene.setSceneRect(self._pix_item.boundingRect())
+        self.ui.gvCamera.fitInView(self._pix_item, Qt.KeepAspectRatio)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._pix_size is not None and self.ui.gvCamera.scene() is self.scene:
+            self._fit_live_view()
+
     def on_sample_clicked(self):
         if self.ui.bSample.isChecked():
             # Enter freeze mode
@@ -154,37 +302,26 @@ class CalibrationOffsetWindow(QWidget):
         self.mouse_press_event_active = True
         # Enter freeze mode: pause camera updates and show processed image
         self.ui.bSample.setIcon(QIcon(':/icons/freeze.png'))
-        if self.timer.isActive():
-            self.timer.stop()
+        self._stop_live_capture()
         self.freeze_mode = True
         
-        # Take 5 images as fast as possible
-        images = []
-        for _ in range(5):
-            if self.camera and hasattr(self.camera, 'read'):
-                ret, frame = self.camera.read()
-                if ret:
-                    images.append(frame.copy())
-        if len(images) < 1:
+        if not self.camera:
             print("[ERROR] No images captured!")
             return
 
-        
-        avg_img = imageProcess.average_image(images)
+        # Take 5 images as fast as possible and average them (no frame list);
+        # the capture thread is stopped: read_latest skips whatever is left in the driver queue
+        reads = (self.camera.read_latest() for _ in range(5))
+        avg_img = imageProcess.average_image(frame for ret, frame in reads if ret)
+        if avg_img is None:
+            print("[ERROR] No images captured!")
+            return
 
-        # Undistort averaged image
-        undistorted_img = avg_img
-        if self.active_camera_id:
-            try:
-                undistorted_img = imageProcess.undistort_image(self.active_camera_id, avg_img)
-            except Exception as e:
-                print(f"[ERROR] undistort_image failed: {e}")
+        # Undistort averaged image (returns avg_img as is without geometric calibration)
+        undistorted_img = self._undistort(avg_img)
 
-        # Show result in MarkerImageWidget
-        rgb_img = cv2.cvtColor(undistorted_img, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_img.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_img.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        # Show result in MarkerImageWidget (convertScaleAbs/remap output is contiguous)
+        qt_image, self._last_frame = _bgr_to_qimage(undistorted_img)
 
         # Remove QGraphicsView content and overlay MarkerImageWidget
         self.ui.gvCamera.setScene(None)
@@ -193,11 +330,9 @@ class CalibrationOffsetWindow(QWidget):
             self.marker_widget.deleteLater()
         self.marker_widget = MarkerImageWidget(self.ui.gvCamera)
         self.marker_widget.set_image(qt_image)
-        self.marker_widget.add_marker_group(0, (255,0,0))
         # prepare groups 0..3
-        self.marker_widget.add_marker_group(1, (0,255,0))
-        self.marker_widget.add_marker_group(2, (0,0,255))
-        self.marker_widget.add_marker_group(3, (255,255,0))
+        for group, color in enumerate(MARKER_GROUP_COLORS):
+            self.marker_widget.add_marker_group(group, color)
         self.marker_id_counters = {0:0, 1:0, 2:0, 3:0}
         self.selected_marker_group = 0
         # show marker buttons and select first
@@ -215,8 +350,7 @@ class CalibrationOffsetWindow(QWidget):
         # Resume live camera view
         self.ui.bSample.setIcon(QIcon(':/icons/foto.png'))
         self.freeze_mode = False
-        if not self.timer.isActive():
-            self.timer.start(33)
+        self._start_live_capture()
         # Remove marker widget and restore QGraphicsView
         if self.marker_widget is not None:
             self.marker_widget.setParent(None)
@@ -239,21 +373,41 @@ class CalibrationOffsetWindow(QWidget):
         self.selected_marker_group = 0
         # Reset per-group counters to zero and update labels
         self.marker_counters_by_group = {0:0, 1:0, 2:0, 3:0}
-        self.ui.lXt.setText(f"0/{self.num_offset_marker}")
-        self.ui.lXb.setText(f"0/{self.num_offset_marker}")
-        self.ui.lYl.setText(f"0/{self.num_offset_marker}")
-        self.ui.lYr.setText(f"0/{self.num_offset_marker}")
         # reset label colors to orange
-        orange_style = "QLabel { color: orange; font-weight: bold; font-size: 16pt; }"
-        self.ui.lXt.setStyleSheet(orange_style)
-        self.ui.lXb.setStyleSheet(orange_style)
-        self.ui.lYl.setStyleSheet(orange_style)
-        self.ui.lYr.setStyleSheet(orange_style)
+        for label in self._group_labels.values():
+            label.setText(f"0/{self.num_offset_marker}")
+            label.setStyleSheet(LABEL_STYLE_OPEN)
         self.marker_id_counters = {}
         # hide continue button on unfreeze
         self.ui.bContinue.setHidden(True)
         self.ui.gvCamera.setScene(self.scene)
     
+    def refresh_calibration(self):
+        # parse the geometric calibration of the active camera once instead of on every freeze
+        self._K = self._D = None
+        self._undist_maps = None
+        if not self.active_camera_id:
+            return
+        try:
+            self._K, self._D = imageProcess.load_geometric_calibration(self.active_camera_id)
+        except Exception as e:
+            print(f"[ERROR] Could not load geometric calibration: {e}")
+
+    def _undistort(self, img):
+        # remap with cached CV_16SC2 maps; the maps are rebuilt only when the frame size changes
+        if self._K is None:
+            return img
+        h, w = img.shape[:2]
+        try:
+            if self._undist_maps is None or self._undist_size != (w, h):
+                self._undist_maps = imageProcess.undistort_maps(self._K, self._D, (w, h))
+                self._undist_size = (w, h)
+            map1, map2 = self._undist_maps
+            return cv2.remap(img, map1, map2, cv2.INTER_LINEAR)
+        except Exception as e:
+            print(f"[ERROR] undistort_image failed: {e}")
+            return img
+
     def _marker_mouse_press_event(self, event):
         if self.freeze_mode and self.marker_widget and self.mouse_press_event_active:
             x, y = event.x(), event.y()
@@ -261,32 +415,25 @@ class CalibrationOffsetWindow(QWidget):
             ix, iy = self.marker_widget.widget_to_image(x, y)
 
             # If there's a pending marker (we're in edit mode), update its position
-            if hasattr(self, 'pending_marker') and self.pending_marker is not None:
+            if self.pending_marker is not None:
                 pg, pmid = self.pending_marker
                 # update existing pending marker to new image coords
                 self.marker_widget.set_marker(pg, pmid, ix, iy)
-                self.marker_widget.update()
                 # recenter zoom on updated marker
                 try:
-                    self.marker_widget.zoom_on_marker(pg, pmid, 4.0)
+                    self.marker_widget.zoom_on_marker(pg, pmid, MARKER_ZOOM)
                 except Exception:
                     pass
                 return
 
             # No pending marker: create a new one
-            group = getattr(self, 'selected_marker_group', 0)
-            # ensure counter exists
-            if not hasattr(self, 'marker_id_counters') or group not in self.marker_id_counters:
-                if not hasattr(self, 'marker_id_counters'):
-                    self.marker_id_counters = {}
-                self.marker_id_counters[group] = 0
-            mid = self.marker_id_counters[group]
+            group = self.selected_marker_group
+            mid = self.marker_id_counters.get(group, 0)
             self.marker_widget.set_marker(group, mid, ix, iy)
             self.marker_id_counters[group] = mid + 1
-            self.marker_widget.update()
             # Zoom 4x on the newly placed marker, hide group buttons, show accept/decline
             try:
-                self.marker_widget.zoom_on_marker(group, mid, 4.0)
+                self.marker_widget.zoom_on_marker(group, mid, MARKER_ZOOM)
             except Exception:
                 pass
             # hide marker selection buttons
@@ -300,7 +447,7 @@ class CalibrationOffsetWindow(QWidget):
 
     def on_accept_clicked(self):
         # Commit pending marker (already in widget). Reset view and UI.
-        if not hasattr(self, 'pending_marker') or self.pending_marker is None:
+        if self.pending_marker is None:
             return
         # Commit: increase label counter for the group
         group, mid = self.pending_marker
@@ -311,18 +458,10 @@ class CalibrationOffsetWindow(QWidget):
         # update corresponding label text and color
         try:
             count = self.marker_counters_by_group.get(group, 0)
-            if group == 0:
-                self.ui.lXt.setText(f"{count}/{self.num_offset_marker}")
-                self.ui.lXt.setStyleSheet("QLabel { color: green; font-weight: bold; font-size: 16pt; }" if count >= self.num_offset_marker else "QLabel { color: orange; font-weight: bold; font-size: 16pt; }")
-            elif group == 1:
-                self.ui.lXb.setText(f"{count}/{self.num_offset_marker}")
-                self.ui.lXb.setStyleSheet("QLabel { color: green; font-weight: bold; font-size: 16pt; }" if count >= self.num_offset_marker else "QLabel { color: orange; font-weight: bold; font-size: 16pt; }")
-            elif group == 2:
-                self.ui.lYl.setText(f"{count}/{self.num_offset_marker}")
-                self.ui.lYl.setStyleSheet("QLabel { color: green; font-weight: bold; font-size: 16pt; }" if count >= self.num_offset_marker else "QLabel { color: orange; font-weight: bold; font-size: 16pt; }")
-            elif group == 3:
-                self.ui.lYr.setText(f"{count}/{self.num_offset_marker}")
-                self.ui.lYr.setStyleSheet("QLabel { color: green; font-weight: bold; font-size: 16pt; }" if count >= self.num_offset_marker else "QLabel { color: orange; font-weight: bold; font-size: 16pt; }")
+            label = self._group_labels.get(group)
+            if label is not None:
+                label.setText(f"{count}/{self.num_offset_marker}")
+                label.setStyleSheet(LABEL_STYLE_DONE if count >= self.num_offset_marker else LABEL_STYLE_OPEN)
         except Exception:
             pass
 
@@ -340,7 +479,7 @@ class CalibrationOffsetWindow(QWidget):
         # show marker selection buttons and restore previous selection
         for i, btn in enumerate(self.marker_buttons):
             btn.setHidden(False)
-            btn.setChecked(i == getattr(self, 'selected_marker_group', 0))
+            btn.setChecked(i == self.selected_marker_group)
         # If all counts reached num_offset_marker, show bContinue
         try:
             all_ok = all(c >= self.num_offset_marker for c in self.marker_counters_by_group.values())
@@ -354,7 +493,7 @@ class CalibrationOffsetWindow(QWidget):
 
     def on_decline_clicked(self):
         # Remove pending marker and reset UI
-        if not hasattr(self, 'pending_marker') or self.pending_marker is None:
+        if self.pending_marker is None:
             return
         group, mid = self.pending_marker
         # remove marker
@@ -364,7 +503,7 @@ class CalibrationOffsetWindow(QWidget):
             except Exception:
                 pass
         # decrement counter so next marker reuses id
-        if hasattr(self, 'marker_id_counters') and group in self.marker_id_counters:
+        if group in self.marker_id_counters:
             if self.marker_id_counters[group] > 0:
                 self.marker_id_counters[group] -= 1
         self.pending_marker = None
@@ -381,7 +520,7 @@ class CalibrationOffsetWindow(QWidget):
         # show marker selection buttons and restore previous selection
         for i, btn in enumerate(self.marker_buttons):
             btn.setHidden(False)
-            btn.setChecked(i == getattr(self, 'selected_marker_group', 0))
+            btn.setChecked(i == self.selected_marker_group)
         # ensure continue button hidden when declining
         try:
             self.ui.bContinue.setHidden(True)
@@ -400,9 +539,11 @@ class CalibrationOffsetWindow(QWidget):
                 else:
                     markers = {'xt': [], 'xb': [], 'yl': [], 'yr': []}
                 # Debug: print marker data to terminal
-                print("[DEBUG] Marker data for axes computation:")
-                for group, points in markers.items():
-                    print(f"  {group}: {points}")
+                # formatting the point arrays is not free: only when debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Marker data for axes computation:")
+                    for group, points in markers.items():
+                        logger.debug("  %s: %s", group, points)
 
                 # compute Az, tx, ty and store to instance for later use
                 az, tx, ty = markerHelper.compute_world_axes_from_markers(markers)
@@ -435,10 +576,13 @@ class CalibrationOffsetWindow(QWidget):
                 y_end = coords['y_end']
                 if self.marker_widget:
                     try:
+                        self.marker_widget.begin_line_batch((255,0,0), width=3)
                         self.marker_widget.draw_line_on_image(x_start, x_end, (255,0,0), width=3)
                         self.marker_widget.draw_line_on_image(y_start, y_end, (0,255,0), width=3)
                     except Exception as e:
                         print(f"[ERROR] drawing axes failed: {e}")
+                    finally:
+                        self.marker_widget.end_line_batch()
                 # set flag so next press opens dialog
                 self.on_continue_clicked_cnt = 1
                 # keep continue button visible
@@ -491,7 +635,7 @@ class CalibrationOffsetWindow(QWidget):
                     # call on_exit_callback if set (restores main UI)
                     try:
                         if hasattr(self, 'on_exit_callback') and self.on_exit_callback:
-                            print("[DEBUG] caliOffset: Calling on_exit_callback from dialog OK")
+                            logger.debug("caliOffset: Calling on_exit_callback from dialog OK")
                             self.on_exit_callback()
                     except Exception as e:
                         print(f"[ERROR] on_exit_callback failed: {e}")
@@ -503,15 +647,14 @@ class CalibrationOffsetWindow(QWidget):
 
     def cleanup(self):
         """Cleanup resources"""
-        if self.timer.isActive():
-            self.timer.stop()
+        self._stop_live_capture()
         self.cleanup_camera()
 
     def on_exit_clicked(self):
-        print("[DEBUG] caliOffset: Exit clicked")
+        logger.debug("caliOffset: Exit clicked")
         self.cleanup()
         if hasattr(self, 'on_exit_callback') and self.on_exit_callback:
-            print("[DEBUG] caliOffset: Calling on_exit_callback")
+            logger.debug("caliOffset: Calling on_exit_callback")
             self.on_exit_callback()
         #self.close()
 
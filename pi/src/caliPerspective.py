@@ -6,7 +6,7 @@ Minimal Perspective Calibration GUI
 - bSample: changes icon on button press
 """
 
-from PyQt5.QtWidgets import QWidget, QApplication, QGraphicsScene, QDialog
+from PyQt5.QtWidgets import QWidget, QApplication, QGraphicsScene, QGraphicsPixmapItem, QGraphicsView, QDialog
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap, QIcon
 from caliPerspectiveWin import Ui_Form as Ui_CalibrationPerspectiveWindow
@@ -14,7 +14,7 @@ import appSettings
 import camera
 import sys
 import cv2
-import numpy as np
+import imageProcess
 from caliDialog import Ui_CalibrationDialog
 from caliPerspectiveThread import CaliPerspectiveThread
 
@@ -24,14 +24,23 @@ class CalibrationPerspectiveWindow(QWidget):
         self.ui = Ui_CalibrationPerspectiveWindow()
         self.ui.setupUi(self)
         self.scene = QGraphicsScene()
+        # fewer than 10 items: no BSP index, no painter save/restore or antialias margins
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.ui.gvCamera.setScene(self.scene)
+        self.ui.gvCamera.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.ui.gvCamera.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+        # One persistent item for the live view; only its pixmap is swapped per frame
+        self.pixmap_item = QGraphicsPixmapItem()
+        self.scene.addItem(self.pixmap_item)
+        self._pix_size = None
+        self._view_size = (max(1, self.ui.gvCamera.width()), max(1, self.ui.gvCamera.height()))
+        self._rgb_frame = None
         self.camera = camera.Camera()
         self.timer = QTimer()
         self.active_camera_id = None
         self.setup_connections()
         self.init_camera()
         self.sample_icon_state = False
-        self.captured_samples = []  # Store captured images here
         self.timer.timeout.connect(self.update_camera_background)
         self.timer.start(33)  # ~30 FPS
 
@@ -46,41 +55,64 @@ class CalibrationPerspectiveWindow(QWidget):
             self.active_camera_id = None
 
     def update_camera_background(self):
+        # plain read(): Camera already caps the driver queue at one buffer, and
+        # read_latest would block this GUI tick until the sensor's next frame
         if self.camera and hasattr(self.camera, 'read'):
             ret, frame = self.camera.read()
             if ret:
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qt_image)
-                self.scene.clear()
-                self.scene.addPixmap(pixmap)
-                self.ui.gvCamera.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+                # shrink to the view first, then convert only the small image
+                # (one resize + one cvtColor instead of full-frame convert + Qt smooth scale)
+                fh, fw = frame.shape[:2]
+                w, h = self._preview_size(fw, fh)
+                if (w, h) != (fw, fh):
+                    frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_LINEAR)
+                # keep the array on self while the QImage points into it
+                self._rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                qt_image = QImage(self._rgb_frame.data, w, h, self._rgb_frame.strides[0], QImage.Format_RGB888)
+                self.pixmap_item.setPixmap(QPixmap.fromImage(qt_image))
+                # refit only when the frame size changes (resizeEvent handles view changes)
+                if self._pix_size != (w, h):
+                    self._pix_size = (w, h)
+                    self._fit_live_view()
         # Show active camera ID in window title
         if self.active_camera_id:
             self.setWindowTitle(f"Perspective Calibration - Active Camera: {self.active_camera_id}")
         else:
             self.setWindowTitle("Perspective Calibration - No Camera")
 
+    def _fit_live_view(self):
+        self.scene.setSceneRect(self.pixmap_item.boundingRect())
+        self.ui.gvCamera.fitInView(self.pixmap_item, Qt.KeepAspectRatio)
+
+    def _preview_size(self, w, h):
+        # fit into the view keeping the aspect ratio, never upscale
+        view_w, view_h = self._view_size
+        scale = min(view_w / w, view_h / h, 1.0)
+        return max(1, int(w * scale)), max(1, int(h * scale))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # view size is cached here instead of being queried every frame
+        self._view_size = (max(1, self.ui.gvCamera.width()), max(1, self.ui.gvCamera.height()))
+        if self._pix_size is not None:
+            self._fit_live_view()
+
     def on_sample_clicked(self):
         # Toggle icon state based on checked state
         self.ui.bSample.setDisabled(True)
-        # Take 5 photos and save to array
-        self.captured_samples = []
-        for i in range(5):
-            if self.camera and hasattr(self.camera, 'read'):
-                ret, frame = self.camera.read()
-                if ret:
-                    frame_bgr = np.ascontiguousarray(frame.astype(np.uint8))
-                    self.captured_samples.append(frame_bgr)
+        # Take 5 photos and average them; read_latest skips frames still queued
+        # in the driver, so these are 5 fresh frames rather than stale buffers
+        avg_img = None
+        if self.camera and hasattr(self.camera, 'read_latest'):
+            reads = (self.camera.read_latest() for _ in range(5))
+            avg_img = imageProcess.average_image(frame for ret, frame in reads if ret)
         # Pause camera updates
         if self.timer.isActive():
             self.timer.stop()
         # Show dialog after capturing samples
         self.show_processing_dialog()
         # Start processing thread
-        self.processing_thread = CaliPerspectiveThread(self.captured_samples)
+        self.processing_thread = CaliPerspectiveThread(avg_img)
         self.processing_thread.result_ready.connect(self.on_processing_result)
         self.processing_thread.error.connect(self.on_processing_error)
         self.processing_thread.start()
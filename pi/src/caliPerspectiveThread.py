@@ -1,6 +1,6 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 import appSettings
-from imageProcess import average_image, undistort_image
+from imageProcess import undistort_image
 from cameraProcess import rot_scale
 
 class CaliPerspectiveThread(QThread):
@@ -8,13 +8,18 @@ class CaliPerspectiveThread(QThread):
     result_ready = pyqtSignal(float, float, float)
     error = pyqtSignal(str)
 
-    def __init__(self, images):
+    def __init__(self, avg_img):
         super().__init__()
-        self.images = images
+        # averaged sample (the window sums its frames into an integer accumulator);
+        # None if no frame could be captured
+        self.avg_img = avg_img
 
     def run(self):
         try:
-            avg_img = average_image(self.images)
+            if self.avg_img is None:
+                self.error.emit('No images captured.')
+                return
+            avg_img = self.avg_img
             # Get the correct camera_id (camera name, not device number)
             settings = appSettings.get_app_settings()
             active_camera = settings.get('active_camera', {})
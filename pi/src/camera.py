@@ -8,16 +8,56 @@ Camera Handling Module
 
 # Imports
 import os
+import time
+import queue
+import asyncio
+import threading
 import cv2
+import numpy as np
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QImage
+from PyQt5.QtGui import QImage, QOpenGLContext
+from PyQt5.QtWidgets import QOpenGLWidget
 import appSettings
 
+# Optional: pyudev liest die udev-Properties direkt über libudev (kein fork/exec von udevadm)
+try:
+    import pyudev
+    _UDEV_CONTEXT = pyudev.Context()
+except Exception:
+    pyudev = None
+    _UDEV_CONTEXT = None
+
+# Qt >= 5.14 kann BGR-Frames direkt anzeigen (spart cvtColor BGR->RGB pro Frame)
+_QIMAGE_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+# Format-Namen (Settings/TreeView bzw. v4l2-ctl) -> FOURCC; "MJPEG" und "MJPG" meinen dasselbe
+FORMAT_FOURCC = {'MJPEG': 'MJPG', 'MJPG': 'MJPG', 'YUYV': 'YUYV', 'H264': 'H264'}
+
+
+def format_to_fourcc(fmt):
+    """Return the OpenCV FOURCC code for a format name, or None if unknown."""
+    code = FORMAT_FOURCC.get(fmt)
+    return cv2.VideoWriter_fourcc(*code) if code else None
+
+
+def fourcc_to_str(fourcc):
+    return "".join([chr((int(fourcc) >> 8 * i) & 0xFF) for i in range(4)])
+
 # Hardware-related: Get unique camera ID (Serial Number or USB Path) for a given index
 def get_camera_id(camera_index):
+    video_device = f"/dev/video{camera_index}"
+    if _UDEV_CONTEXT is not None:
+        try:
+            dev = pyudev.Devices.from_device_file(_UDEV_CONTEXT, video_device)
+            props = dev.properties
+            camera_id = props.get('ID_SERIAL') or props.get('ID_PATH') or f"video{camera_index}"
+            print(f"[LOG] Camera {camera_index} ID: {camera_id}")
+            return camera_id
+        except Exception as e:
+            print(f"[ERROR] pyudev lookup failed, falling back to udevadm: {e}")
     try:
-        video_device = f"/dev/video{camera_index}"
         result = subprocess.run(
             ['udevadm', 'info', '--query=property', '--name', video_device],
             capture_output=True,
@@ -106,6 +146,39 @@ def list_video_devices(max_devices=10):
     return devices
 
 
+def _parse_v4l2_formats(output):
+    """Parse `v4l2-ctl --list-formats-ext` output into {format: {resolution: [fps, ...]}}."""
+    formats = {}
+    current_format = None
+    current_resolution = None
+    for line in output.split('\n'):
+        # Format line: "[0]: 'MJPG' (Motion-JPEG, compressed)"
+        if "'" in line and ":" in line:
+            parts = line.split(":", 1)
+            if len(parts) > 1 and "'" in parts[1]:
+                fmt = parts[1].split("'", 2)[1]
+                current_format = fmt
+                formats[current_format] = {}
+                continue
+        # Resolution line: "Size: Discrete 640x480"
+        if "Size: Discrete" in line:
+            res = line.split("Size: Discrete", 1)[1].strip()
+            current_resolution = res
+            if current_format:
+                formats[current_format][current_resolution] = []
+            continue
+        # FPS line: "Interval: Discrete 0.033s (30.000 fps)"
+        if "fps)" in line:
+            try:
+                fps = int(float(line.split("(")[-1].split()[0]))
+                if current_format and current_resolution:
+                    if fps not in formats[current_format][current_resolution]:
+                        formats[current_format][current_resolution].append(fps)
+            except Exception:
+                pass
+    return formats
+
+
 # Called in caliDevice.py lines 145, 216 and in this file
 def get_camera_capabilities(camera_index):
     """Query supported formats, resolutions, and FPS using v4l2-ctl."""
@@ -120,36 +193,7 @@ def get_camera_capabilities(camera_index):
         if result.returncode != 0:
             print(f"[ERROR] v4l2-ctl failed: {result.stderr}")
             return {}
-        output = result.stdout
-        formats = {}
-        current_format = None
-        current_resolution = None
-        for line in output.split('\n'):
-            # Format line: "[0]: 'MJPG' (Motion-JPEG, compressed)"
-            if "'" in line and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) > 1 and "'" in parts[1]:
-                    fmt = parts[1].split("'", 2)[1]
-                    current_format = fmt
-                    formats[current_format] = {}
-                    continue
-            # Resolution line: "Size: Discrete 640x480"
-            if "Size: Discrete" in line:
-                res = line.split("Size: Discrete", 1)[1].strip()
-                current_resolution = res
-                if current_format:
-                    formats[current_format][current_resolution] = []
-                continue
-            # FPS line: "Interval: Discrete 0.033s (30.000 fps)"
-            if "fps)" in line:
-                try:
-                    fps = int(float(line.split("(")[-1].split()[0]))
-                    if current_format and current_resolution:
-                        if fps not in formats[current_format][current_resolution]:
-                            formats[current_format][current_resolution].append(fps)
-                except Exception:
-                    pass
-        return formats
+        return _parse_v4l2_formats(result.stdout)
     except subprocess.TimeoutExpired:
         print(f"[ERROR] v4l2-ctl timeout for {video_device}")
         return {}
@@ -160,6 +204,93 @@ def get_camera_capabilities(camera_index):
         print(f"[ERROR] Could not read camera capabilities: {e}")
         return {}
 
+
+async def _get_camera_capabilities_async(camera_index, timeout=5):
+    """asyncio-Variante von get_camera_capabilities (ein v4l2-ctl Prozess pro Kamera)."""
+    video_device = f"/dev/video{camera_index}"
+    proc = await asyncio.create_subprocess_exec(
+        'v4l2-ctl', '--device', video_device, '--list-formats-ext',
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        print(f"[ERROR] v4l2-ctl timeout for {video_device}")
+        return {}
+    if proc.returncode != 0:
+        print(f"[ERROR] v4l2-ctl failed: {stderr.decode(errors='replace')}")
+        return {}
+    return _parse_v4l2_formats(stdout.decode(errors='replace'))
+
+
+async def get_all_camera_capabilities_async(indices):
+    """Query capabilities of several cameras concurrently.
+
+    Startet alle v4l2-ctl Prozesse gleichzeitig und wartet gemeinsam auf sie,
+    die Gesamtdauer ist damit ~max(T) statt N * T.
+    Returns {camera_index: capabilities}.
+    """
+    indices = list(indices)
+    results = await asyncio.gather(
+        *(_get_camera_capabilities_async(i) for i in indices),
+        return_exceptions=True
+    )
+    capabilities = {}
+    for idx, res in zip(indices, results):
+        if isinstance(res, FileNotFoundError):
+            print(f"[ERROR] v4l2-ctl not found - install with: sudo apt install v4l-utils")
+            res = {}
+        elif isinstance(res, Exception):
+            print(f"[ERROR] Could not read camera capabilities: {res}")
+            res = {}
+        capabilities[idx] = res
+    return capabilities
+
+
+def get_all_camera_capabilities(indices):
+    """Blocking wrapper around get_all_camera_capabilities_async (for worker threads).
+
+    Fällt auf einen ThreadPoolExecutor mit get_camera_capabilities zurück,
+    falls asyncio hier nicht nutzbar ist (z.B. bereits laufender Event-Loop).
+    """
+    indices = list(indices)
+    if not indices:
+        return {}
+    try:
+        return asyncio.run(get_all_camera_capabilities_async(indices))
+    except Exception as e:
+        print(f"[LOG] asyncio capability probe unavailable ({e}), using thread pool")
+    with ThreadPoolExecutor(max_workers=len(indices)) as pool:
+        return dict(zip(indices, pool.map(get_camera_capabilities, indices)))
+
+# Called in caliDevice.py, caliOffset.py (camera view setup)
+def setup_gl_viewport(view):
+    """
+    OpenGL-Viewport für eine Kamera-QGraphicsView (GPU skaliert/komponiert das Live-Bild)
+
+    Standard: an, wenn sich ein OpenGL-Kontext anlegen lässt; ohne GL (z.B. headless)
+    bleibt der Raster-Viewport. hardware_setting.opengl_viewport (true/false) überschreibt
+    die Prüfung, z.B. für Images mit fehlerhaftem GL-Treiber.
+
+    Returns:
+        bool: True wenn der OpenGL-Viewport gesetzt wurde
+    """
+    enabled = appSettings.get_hardware_settings().get('opengl_viewport')
+    if enabled is False:
+        print("[LOG] OpenGL viewport disabled in settings, using raster viewport")
+        return False
+    try:
+        if enabled is None and not QOpenGLContext().create():
+            raise RuntimeError("could not create OpenGL context")
+        view.setViewport(QOpenGLWidget())
+        return True
+    except Exception as e:
+        print(f"[LOG] OpenGL viewport not available, using raster viewport: {e}")
+        return False
+
 # Called in caliDevice.py line 481 and in this file
 # non-blocking, real-time display, you need a threaded or asynchronous approach
 class VideoThread(QThread):
@@ -167,60 +298,241 @@ class VideoThread(QThread):
 
     This encapsulates the simple capture loop and emits QImage frames via
     the `change_pixmap_signal` so UI code doesn't need to reimplement it.
+
+    The emitted QImage is not copied: it is built directly on the numpy
+    buffer of the converted frame and does NOT keep that buffer alive.
+    The signal therefore carries the ndarray as second argument; a receiver
+    that stores the QImage (e.g. to repaint it later) must store the array
+    with it. Each frame gets a fresh array, the thread never writes into an
+    emitted one. Connect with Qt.QueuedConnection and draw it directly
+    (QPainter.drawImage) instead of converting it to a QPixmap.
     """
 
-    change_pixmap_signal = pyqtSignal(QImage)
+    # (QImage, ndarray backing the QImage)
+    change_pixmap_signal = pyqtSignal(QImage, object)
+    # Kamera-Index, falls das Öffnen fehlschlägt
+    open_failed = pyqtSignal(int)
 
-    def __init__(self, camera_index=0, width=640, height=480, fps=30, fourcc=None):
+    def __init__(self, camera_index=0, width=640, height=480, fps=30, fourcc=None, color=True, display_size=None, display_hz=None,
+                 buffer_count=1):
+        """
+        Args:
+            color (bool): False zeigt die Vorschau als Graustufen (Format_Grayscale8, 1 Byte/Pixel);
+                bei YUYV wird direkt die Y-Ebene ohne Farbkonvertierung verwendet
+            display_size (tuple): (width, height) der Anzeige; größere Frames werden vorher verkleinert
+            display_hz (float): Bildwiederholrate der Anzeige; überzählige Frames werden nicht emittiert
+            buffer_count (int): Anzahl der V4L2-Capture-Buffer (CAP_PROP_BUFFERSIZE). 1 = geringste Latenz,
+                der Treiber verwirft veraltete Frames; bei hohen Frameraten führen zu wenige zu Frame-Drops
+        """
         super().__init__()
         self.camera_index = camera_index
         self.width = width
         self.height = height
         self.fps = fps
         self.fourcc = fourcc
+        self.color = color
+        self.display_size = display_size
+        self.display_hz = display_hz
+        self.buffer_count = buffer_count
         self._run_flag = True
+        # Zuletzt emittiertes numpy-Array; hält den Speicher des QImage am Leben,
+        # das ohne Kopie direkt auf diesem Puffer aufgebaut wird
+        self._frame = None
 
     def run(self):
         """Main loop: read frames and emit QImage frames for the UI."""
+        cap = self._open_capture()
+        if cap is None:
+            return
+
+        while self._run_flag:
+            if not self._capture_step(cap):
+                break
+
+        self._release_capture(cap)
+
+    def _open_capture(self):
+        """Öffne die Kamera mit den aktuellen Attributen; None bei Fehler (open_failed wird emittiert)."""
         cap = cv2.VideoCapture(self.camera_index, cv2.CAP_V4L2)
 
         if not cap.isOpened():
             print(f"[ERROR] Could not open camera {self.camera_index}")
-            return
+            self.open_failed.emit(self.camera_index)
+            return None
 
+        # FOURCC vor Auflösung/FPS setzen, die Reihenfolge zählt bei V4L2
         if self.fourcc is not None:
             cap.set(cv2.CAP_PROP_FOURCC, self.fourcc)
 
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
         cap.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_count:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_count)
+        # Mehrere Decoder-Threads anfordern (CAP_PROP_N_THREADS gibt es erst ab OpenCV 4.12;
+        # Backends, die es nicht unterstützen, ignorieren es)
+        if hasattr(cv2, 'CAP_PROP_N_THREADS'):
+            if cap.set(cv2.CAP_PROP_N_THREADS, min(4, os.cpu_count() or 1)):
+                print(f"[LOG] Camera {self.camera_index} decoder threads: {int(cap.get(cv2.CAP_PROP_N_THREADS))}")
 
         actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         actual_fps = int(cap.get(cv2.CAP_PROP_FPS))
+        self._actual_height = actual_height
 
-        print(f"[LOG] Camera {self.camera_index} opened: {actual_width}x{actual_height} @ {actual_fps}fps")
+        actual_fourcc = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
 
-        while self._run_flag:
-            ret, frame = cap.read()
-            if ret:
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                self.change_pixmap_signal.emit(qt_image)
-            else:
-                print("[ERROR] Failed to read frame")
-                break
+        print(f"[LOG] Camera {self.camera_index} opened: {actual_width}x{actual_height} @ {actual_fps}fps ({actual_fourcc})")
+
+        # YUYV ohne Farbwunsch: Rohdaten holen und nur die Y-Ebene anzeigen
+        self._yuyv_gray = not self.color and self.fourcc == cv2.VideoWriter_fourcc(*'YUYV')
+        if self._yuyv_gray:
+            cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+        # Zielgröße für die Anzeige (nur verkleinern, Seitenverhältnis beibehalten)
+        self._target_size = None
+        if self.display_size and actual_width > 0 and actual_height > 0:
+            scale = min(self.display_size[0] / actual_width, self.display_size[1] / actual_height)
+            if scale < 1.0:
+                self._target_size = (max(1, int(actual_width * scale)), max(1, int(actual_height * scale)))
+
+        # Frame-Pacing: nicht schneller emittieren als die Anzeige darstellen kann
+        self._emit_interval = 1.0 / self.display_hz if self.display_hz and self.display_hz > 0 else 0.0
+        self._next_emit = 0.0
+        self._grab_only = 0
+        return cap
 
+    def _release_capture(self, cap):
         cap.release()
-        print(f"[LOG] Camera {self.camera_index} released")
+        print(f"[LOG] Camera {self.camera_index} released ({self._grab_only} frames grabbed without decoding)")
 
-    def stop(self):
-        """Stop the thread cleanly."""
+    def _capture_step(self, cap):
+        """Einen Frame holen und ggf. emittieren; False wenn nicht gelesen werden konnte."""
+        # grab() bei jedem Frame, damit die V4L2-Buffer nicht volllaufen;
+        # dekodiert (retrieve) wird nur der Frame, der auch angezeigt wird
+        if not cap.grab():
+            print("[ERROR] Failed to read frame")
+            return False
+        now = time.monotonic()
+        if now < self._next_emit:
+            self._grab_only += 1
+            return True
+        self._next_emit = now + self._emit_interval
+        ret, frame = cap.retrieve()
+        if not ret:
+            print("[ERROR] Failed to read frame")
+            return False
+        gray = None
+        if self._yuyv_gray and not (frame.ndim == 3 and frame.shape[2] == 3):
+            # Packed YUYV: jedes zweite Byte einer Zeile ist Luma
+            gray = frame.reshape(self._actual_height, -1)[:, ::2]
+        elif frame.ndim == 2:
+            # Einkanalige Frames (z.B. GREY) direkt übernehmen
+            gray = frame
+        elif not self.color:
+            # MJPG o.ä. ohne Farbwunsch: nur 1/3 der Daten an die Anzeige
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is not None:
+            if self._target_size:
+                gray = cv2.resize(gray, self._target_size, interpolation=cv2.INTER_AREA)
+            self._frame = np.ascontiguousarray(gray)
+            h, w = self._frame.shape
+            qt_image = QImage(self._frame.data, w, h, self._frame.strides[0], QImage.Format_Grayscale8)
+        else:
+            if self._target_size:
+                frame = cv2.resize(frame, self._target_size, interpolation=cv2.INTER_AREA)
+            if _QIMAGE_BGR888 is not None:
+                self._frame = np.ascontiguousarray(frame)
+                image_format = _QIMAGE_BGR888
+            else:
+                self._frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                image_format = QImage.Format_RGB888
+            h, w = self._frame.shape[:2]
+            qt_image = QImage(self._frame.data, w, h, self._frame.strides[0], image_format)
+        self.change_pixmap_signal.emit(qt_image, self._frame)
+        return True
+
+    def stop(self, wait=True):
+        """Stop the thread cleanly.
+
+        With wait=False only the stop is requested; the caller has to keep a
+        reference until the thread finished (e.g. wait() in a worker thread).
+        """
         print("[LOG] Stopping video thread...")
         self._run_flag = False
-        self.wait()
+        if wait:
+            self.wait()
+
+
+# Marker für "keine neue Konfiguration" in VideoPipeline.run
+_NO_RECONFIG = object()
+
+
+class VideoPipeline(VideoThread):
+    """Langlebiger Capture-Thread, der über eine Queue umkonfiguriert wird.
+
+    Statt für jede Änderung von Kamera/Auflösung/FPS/Format einen neuen
+    VideoThread zu starten (und den alten im GUI-Thread zu joinen), nimmt
+    dieser Thread neue Einstellungen per `configure()` entgegen und öffnet die
+    Kamera selbst neu. `pause()` schließt die Kamera, `stop()` beendet den Thread.
+    """
+
+    def __init__(self, color=True, display_size=None, display_hz=None):
+        super().__init__(camera_index=None, color=color, display_size=display_size, display_hz=display_hz)
+        # maxsize=1: nur die neueste Konfiguration zählt (ältere werden verworfen)
+        self.reconfig_q = queue.Queue(maxsize=1)
+
+    def configure(self, camera_index, width, height, fps, fourcc=None, buffer_count=1):
+        self._post((camera_index, width, height, fps, fourcc, buffer_count))
+
+    def pause(self):
+        self._post(None)
+
+    def _post(self, msg):
+        # Drop-oldest: eine noch nicht abgeholte Konfiguration ersetzen
+        try:
+            self.reconfig_q.get_nowait()
+        except queue.Empty:
+            pass
+        self.reconfig_q.put_nowait(msg)
+
+    def run(self):
+        cap = None
+        while self._run_flag:
+            if cap is None:
+                # Keine Kamera offen: blockierend auf die nächste Konfiguration warten
+                msg = self.reconfig_q.get()
+            else:
+                try:
+                    msg = self.reconfig_q.get_nowait()
+                except queue.Empty:
+                    msg = _NO_RECONFIG
+
+            if msg is not _NO_RECONFIG:
+                if cap is not None:
+                    self._release_capture(cap)
+                    cap = None
+                if msg is None or not self._run_flag:
+                    continue
+                (self.camera_index, self.width, self.height, self.fps,
+                 self.fourcc, self.buffer_count) = msg
+                cap = self._open_capture()
+                continue
+
+            if not self._capture_step(cap):
+                self._release_capture(cap)
+                cap = None
+
+        if cap is not None:
+            self._release_capture(cap)
+
+    def stop(self, wait=True):
+        """Beende den Thread (schließt eine offene Kamera); wait=False wartet nicht auf das Ende."""
+        print("[LOG] Stopping video pipeline...")
+        self._run_flag = False
+        self._post(None)
+        if wait:
+            self.wait()
 
 
 """
@@ -253,11 +565,20 @@ class Camera:
     - Automatische Parametereinstellung (Format, Resolution, FPS)
     """
     
+    # grab() der schneller zurückkommt, holte ein schon gepuffertes (veraltetes) Frame ab
+    QUEUED_GRAB_S = 0.004
+    # Höchstens so viele Frames pro read_latest() verwerfen (V4L2-Queue ist klein)
+    MAX_DRAIN = 4
+    # Intervall für die Log-Zeile mit verworfenen Frames
+    DROP_LOG_INTERVAL_S = 5.0
+
     def __init__(self):
         self.cap = None
         self.camera_id = None
         self.camera_settings = {}
         self.camera_index = None
+        self._dropped = 0
+        self._drop_log_time = time.monotonic()
         
     # Called in: caliOffset.py, caliDistortion.py, caliPerspective.py, camera.py
     def open(self):
@@ -315,10 +636,11 @@ class Camera:
         if not self.cap or not self.cap.isOpened():
             return
         
-        # Setze Format (FOURCC)
+        # Setze Format (FOURCC) - vor Auflösung/FPS, die Reihenfolge zählt bei V4L2
         fourcc_str = self.camera_settings.get("format", "MJPEG")
-        fourcc = cv2.VideoWriter_fourcc(*fourcc_str)
-        self.cap.set(cv2.CAP_PROP_FOURCC, fourcc)
+        fourcc = format_to_fourcc(fourcc_str)
+        if fourcc is not None:
+            self.cap.set(cv2.CAP_PROP_FOURCC, fourcc)
         
         # Setze Auflösung
         res = self.camera_settings.get("resolution", "640x480")
@@ -329,6 +651,9 @@ class Camera:
         # Setze FPS
         fps = self.camera_settings.get("fps", 30)
         self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+        # Nur ein V4L2-Buffer: die Live-Vorschau soll nicht hinter der Aufnahme herhinken
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         print(f"[Camera] Initialized: {self.camera_id}")
         print(f"[Camera] Resolution: {width}x{height} @ {fps}fps, Format: {fourcc_str}")
@@ -345,6 +670,42 @@ class Camera:
             return False, None
         
         return self.cap.read()
+
+    # Called in: caliOffset.py, caliPerspective.py
+    def read_latest(self):
+        """
+        Lese das neueste Frame und verwerfe ältere, die noch im Treiber liegen
+
+        Solange grab() sofort zurückkommt, lag das Frame schon in der Queue;
+        erst ein grab(), das auf die Kamera warten musste, liefert das aktuelle
+        Bild. Nur dieses wird dekodiert (retrieve).
+
+        Returns:
+            tuple: (success, frame) wie read()
+        """
+        if not self.cap or not self.cap.isOpened():
+            return False, None
+
+        grabbed = False
+        for _ in range(self.MAX_DRAIN + 1):
+            start = time.monotonic()
+            if not self.cap.grab():
+                break
+            if grabbed:
+                self._dropped += 1
+            grabbed = True
+            if time.monotonic() - start >= self.QUEUED_GRAB_S:
+                break
+        if not grabbed:
+            return False, None
+
+        now = time.monotonic()
+        if now - self._drop_log_time >= self.DROP_LOG_INTERVAL_S:
+            if self._dropped:
+                print(f"[LOG] Camera {self.camera_index}: dropped {self._dropped} stale frames")
+            self._dropped = 0
+            self._drop_log_time = now
+        return self.cap.retrieve()
     
     # Called in: caliOffset.py, caliDistortion.py, camera.py
     def is_opened(self):
@@ -416,6 +777,101 @@ class Camera:
         width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         fps = int(self.cap.get(cv2.CAP_PROP_FPS))
-        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
-        fmt = "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)])
+        fmt = fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC))
         return {"width": width, "height": height, "fps": fps, "format": fmt}
+
+
+# Called in caliOffset.py
+# Capture loop for a Camera that is already open: the GUI timer only copies the newest frame
+class CameraThread(QThread):
+    """Liest Frames einer geöffneten Camera in einem eigenen Thread.
+
+    grab()/retrieve() laufen abwechselnd in zwei vorab angelegte Puffer
+    (Ping-Pong). Nach jedem Frame wird unter dem Lock nur der Index des
+    neuesten Puffers umgeschaltet; der GUI-Thread kopiert diesen Puffer mit
+    copy_latest() ebenfalls unter dem Lock. Ältere Frames werden so von
+    selbst verworfen, und read() blockiert nie den GUI-Thread.
+
+    Solange der Thread läuft, darf die Camera nicht anderweitig gelesen
+    werden; dafür stop() aufrufen und danach wieder start().
+
+    Mit display_size werden größere Frames schon hier (nicht im GUI-Thread)
+    auf Anzeigegröße verkleinert; die Kamera selbst läuft weiter in der
+    kalibrierten Auflösung, die Standbilder bleiben also voll aufgelöst.
+    """
+
+    def __init__(self, cam, display_size=None):
+        super().__init__()
+        self.camera = cam
+        self.display_size = display_size
+        self._raw = None
+        self._slots = [None, None]
+        self._latest = -1
+        # Zähler der fertigen Frames; unverändert = kein neues Bild
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._run_flag = True
+
+    def run(self):
+        cap = self.camera.cap
+        if cap is None:
+            return
+        self._run_flag = True
+        target = self._target_size(cap)
+        wi = 0
+        while self._run_flag:
+            if not cap.grab():
+                print("[ERROR] Failed to read frame")
+                break
+            if target is None:
+                # in den Puffer schreiben, den copy_latest() gerade nicht liest
+                ret, frame = cap.retrieve(self._slots[wi])
+                if not ret or frame is None:
+                    continue
+                self._slots[wi] = frame
+            else:
+                ret, self._raw = cap.retrieve(self._raw)
+                if not ret or self._raw is None:
+                    continue
+                slot = self._slots[wi]
+                shape = (target[1], target[0]) + self._raw.shape[2:]
+                if slot is None or slot.shape != shape:
+                    slot = self._slots[wi] = np.empty(shape, dtype=self._raw.dtype)
+                cv2.resize(self._raw, target, dst=slot, interpolation=cv2.INTER_AREA)
+            with self._lock:
+                self._latest = wi
+                self.seq += 1
+            wi ^= 1
+
+    def _target_size(self, cap):
+        """Anzeigegröße (nur verkleinern, Seitenverhältnis bleibt); None = Frames unverändert übernehmen."""
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if not self.display_size or w <= 0 or h <= 0:
+            return None
+        scale = min(self.display_size[0] / w, self.display_size[1] / h)
+        if scale >= 1.0:
+            return None
+        return max(1, int(w * scale)), max(1, int(h * scale))
+
+    def copy_latest(self, dst=None):
+        """
+        Kopiere das neueste Frame nach dst (wird bei None/anderer Größe neu angelegt)
+
+        Returns:
+            ndarray oder None, falls noch kein Frame vorliegt
+        """
+        with self._lock:
+            if self._latest < 0:
+                return None
+            src = self._slots[self._latest]
+            if dst is None or dst.shape != src.shape:
+                return src.copy()
+            np.copyto(dst, src)
+            return dst
+
+    def stop(self, wait=True):
+        """Beende die Capture-Schleife (die Camera bleibt geöffnet)."""
+        self._run_flag = False
+        if wait:
+            self.wait()
@@ -2,23 +2,42 @@ import numpy as np
 import cv2
 import appSettings
 
+# undistort_image: remap tables per (camera_id, size, calibration); kept small,
+# there is only one active camera at a time
+_UNDISTORT_MAPS = {}
+_UNDISTORT_MAPS_MAX = 4
+# average_image: uint16 sum buffer, reused while the frame shape stays the same
+# (only called from the GUI thread)
+_AVERAGE_ACC = None
+
 def average_image(images):
     """
-    Takes a list of images (numpy arrays) and returns their average as a single image.
-    Images must be the same shape and dtype.
+    Takes an iterable of uint8 images (numpy arrays, e.g. a generator of camera frames)
+    and returns their average as a single uint8 image, or None if it yields no image.
+    Images must be the same shape. Up to 257 images fit the uint16 sum without overflow.
     """
-    if not images:
-        raise ValueError("No images provided for averaging.")
-    # Stack images and compute mean
-    avg_img = np.mean(np.stack(images, axis=0), axis=0)
-    # Convert to uint8 for display/processing
-    avg_img_uint8 = cv2.convertScaleAbs(avg_img)
-    return avg_img_uint8
+    global _AVERAGE_ACC
+    acc = None
+    count = 0
+    for img in images:
+        if acc is None:
+            acc = _AVERAGE_ACC
+            if acc is None or acc.shape != img.shape:
+                acc = _AVERAGE_ACC = np.zeros(img.shape, dtype=np.uint16)
+            else:
+                acc.fill(0)
+        # Sum in the native integer range, no float32 copy per frame
+        cv2.add(acc, img, dst=acc, dtype=cv2.CV_16U)
+        count += 1
+    if count == 0:
+        return None
+    # Mean and conversion to uint8 in one pass
+    return cv2.convertScaleAbs(acc, alpha=1.0 / count)
 
-def undistort_image(camera_id, image):
+def load_geometric_calibration(camera_id):
     """
-    Undistorts the given image using geometric calibration data from app_settings for the specified camera_id.
-    Returns the undistorted image.
+    Returns (camera_matrix, dist_coeffs) from the geometric calibration data in app_settings
+    for the specified camera_id. Raises ValueError if the shapes are not usable.
     """
     cam_settings = appSettings.get_camera_settings(camera_id)
     intrinsic = cam_settings.get('intrinsic', {})
@@ -32,5 +51,29 @@ def undistort_image(camera_id, image):
         dist_coeffs = dist_coeffs.flatten()
     if dist_coeffs.ndim != 1:
         raise ValueError(f"dist_coeffs shape is {dist_coeffs.shape}, expected 1D array")
-    undistorted = cv2.undistort(image, camera_matrix, dist_coeffs)
+    return camera_matrix, dist_coeffs
+
+def undistort_maps(camera_matrix, dist_coeffs, size):
+    """
+    Builds fixed-point (CV_16SC2) undistort maps for images of size (w, h).
+    cv2.remap(image, map1, map2, cv2.INTER_LINEAR) then gives the same result as
+    cv2.undistort without rebuilding the maps for every image.
+    """
+    return cv2.initUndistortRectifyMap(camera_matrix, dist_coeffs, None, camera_matrix, size, cv2.CV_16SC2)
+
+def undistort_image(camera_id, image):
+    """
+    Undistorts the given image using geometric calibration data from app_settings for the specified camera_id.
+    Returns the undistorted image.
+    """
+    camera_matrix, dist_coeffs = load_geometric_calibration(camera_id)
+    h, w = image.shape[:2]
+    # the calibration values are part of the key, so a new calibration never hits stale maps
+    key = (camera_id, w, h, camera_matrix.tobytes(), dist_coeffs.tobytes())
+    maps = _UNDISTORT_MAPS.get(key)
+    if maps is None:
+        if len(_UNDISTORT_MAPS) >= _UNDISTORT_MAPS_MAX:
+            _UNDISTORT_MAPS.clear()
+        maps = _UNDISTORT_MAPS[key] = undistort_maps(camera_matrix, dist_coeffs, (w, h))
+    undistorted = cv2.remap(image, maps[0], maps[1], cv2.INTER_LINEAR)
     return undistorted
@@ -69,7 +69,7 @@ class MainApp(QMainWindow):
                 if os.path.exists(video_path):
                     camera_id = camera.get_camera_id(i)
                     if camera_id == selected_cam_id:
-                        # Persistence of active camera will be handled by set_selected_camera()
+                        # Persistence of active camera will be handled by set_active_camera()
                         # updating device number
                         appSettings.set_active_camera(i, camera_id)
                         print(f"[LOG] Loaded previously selected camera on startup: index={i}, id={camera_id}")
@@ -4,6 +4,10 @@ import appSettings
 import cv2
 import numpy as np
 import os
+import itertools
+import logging
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
 """
 rectificationHelper.py
 Centralized image rectification helpers for calibration windows.
@@ -17,6 +21,18 @@ Centralized image rectification helpers for calibration windows.
 All functions are pure and reusable, with no UI dependencies.
 """
 
+# Flags for cv2.findChessboardCornersSB (used before the classic detector)
+SB_FLAGS = cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_EXHAUSTIVE | cv2.CALIB_CB_ACCURACY
+# Fast detection: search on a pyrDown copy, refine with cornerSubPix at full resolution.
+# Set FAST_DETECTION = False (or pass fast=False) for the slower full-resolution search.
+FAST_DETECTION = True
+FAST_DETECTION_MIN_SIDE = 720
+# cv2.calibrateCamera: LU instead of the SVD-based solver, and a looser LM stop
+# criterion. The default is (COUNT+EPS, 30, DBL_EPSILON), i.e. in practice always all
+# 30 iterations; eps=1e-4 stops early once the parameter update has converged.
+CALIBRATE_FLAGS = cv2.CALIB_USE_LU
+CALIBRATE_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 1e-4)
+
 
 
 
@@ -31,36 +47,74 @@ def ensure_sample_dir(sample_dir):
     """Ensure the sample directory exists."""
     os.makedirs(sample_dir, exist_ok=True)
 
- # Used in caliDistortion.py (camera calibration)
-def calibrate_camera_from_samples(sample_dir, max_samples, checkerboard_sizes, detected_checkerboard_size, square_size):
+ # Used in caliDistortion.py, calibrate_camera_from_frames, compute_perspective_from_samples (object points)
+def make_object_points(pattern_size, square_size):
+    """Return the (N, 3) float32 chessboard object-point grid for pattern_size (inner corners), scaled by square_size."""
+    objp = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
+    objp[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2)
+    objp *= square_size
+    return objp
+
+ # Used in caliDistortion.py (camera calibration from the sample files)
+def calibrate_camera_from_samples(sample_dir, max_samples, checkerboard_sizes, detected_checkerboard_size, square_size,
+                                  objp=None):
     """Calibrate camera using checkerboard images in sample_dir. Returns (success, camera_matrix, dist_coeffs, error, detected_size, successful_count)."""
+    # Paths are decoded inside the detection workers (in parallel)
+    paths = [os.path.join(sample_dir, f"sample_{i:02d}.jpg") for i in range(1, max_samples + 1)]
+    paths = [p for p in paths if os.path.exists(p)]
+    return calibrate_camera_from_frames(paths, max_samples, checkerboard_sizes, detected_checkerboard_size, square_size,
+                                        objp=objp)
+
+ # Used in calibrate_camera_from_samples, calibrate_camera_from_shared_frames (camera calibration)
+def calibrate_camera_from_frames(frames, max_samples, checkerboard_sizes, detected_checkerboard_size, square_size,
+                                 objp=None):
+    """Calibrate camera from an iterable of BGR images (or image paths). Same return value as calibrate_camera_from_samples.
+
+    Corner detection runs concurrently in a thread pool (OpenCV releases the GIL).
+    `objp` is a prebuilt object-point grid (see make_object_points); it is shared by
+    all views of matching size instead of being rebuilt per image.
+    """
+    def detect(img):
+        if isinstance(img, str):
+            img = cv2.imread(img)
+        if img is None:
+            return None
+        found, found_size, found_corners = find_checkerboard_corners(img, checkerboard_sizes, detected_checkerboard_size)
+        return found, found_size, found_corners, (img.shape[1], img.shape[0])
+
+    images = list(itertools.islice(frames, max_samples))
+    with ThreadPoolExecutor(max_workers=max(1, min(len(images), os.cpu_count() or 1))) as pool:
+        results = list(pool.map(detect, images))
+
+    # One object-point grid per pattern size, shared by all views
+    grids = {}
     objpoints = []
     imgpoints = []
     image_size = None
     successful_images = 0
-    for i in range(1, max_samples + 1):
-        filename = f"sample_{i:02d}.jpg"
-        filepath = os.path.join(sample_dir, filename)
-        if not os.path.exists(filepath):
+    for res in results:
+        if res is None:
             continue
-        img = cv2.imread(filepath)
-        if img is None:
-            continue
-        found, found_size, found_corners = find_checkerboard_corners(img, checkerboard_sizes, detected_checkerboard_size)
+        found, found_size, found_corners, size = res
         if found:
-            objp = np.zeros((found_size[0] * found_size[1], 3), np.float32)
-            objp[:, :2] = np.mgrid[0:found_size[0], 0:found_size[1]].T.reshape(-1, 2)
-            objp *= square_size
-            objpoints.append(objp)
+            found_size = tuple(found_size)
+            if found_size not in grids:
+                if objp is not None and len(objp) == found_size[0] * found_size[1]:
+                    grids[found_size] = objp
+                else:
+                    grids[found_size] = make_object_points(found_size, square_size)
+            objpoints.append(grids[found_size])
             imgpoints.append(found_corners)
             successful_images += 1
             if image_size is None:
-                image_size = img.shape[1], img.shape[0]
+                image_size = size
             if detected_checkerboard_size is None:
                 detected_checkerboard_size = found_size
     if successful_images < 3:
         return False, None, None, None, None, successful_images
-    ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(objpoints, imgpoints, image_size, None, None)
+    ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(
+        objpoints, imgpoints, image_size, None, None,
+        flags=CALIBRATE_FLAGS, criteria=CALIBRATE_CRITERIA)
     mean_error = 0
     for i in range(len(objpoints)):
         imgpoints2, _ = cv2.projectPoints(objpoints[i], rvecs[i], tvecs[i], camera_matrix, dist_coeffs)
@@ -69,6 +123,37 @@ def calibrate_camera_from_samples(sample_dir, max_samples, checkerboard_sizes, d
     mean_error /= len(objpoints)
     return True, camera_matrix, dist_coeffs, mean_error, detected_checkerboard_size, successful_images
 
+ # Used in caliDistortion.py (ProcessingThread, frames in the shared-memory sample ring)
+def calibrate_camera_from_shared_frames(shared_frames, max_samples, checkerboard_sizes, detected_checkerboard_size, square_size,
+                                        objp=None):
+    """Calibrate camera from frames in a multiprocessing.shared_memory block. Same return value as calibrate_camera_from_samples.
+
+    `shared_frames` is (shm_name, ring_shape, count): the block holds a uint8 array of
+    ring_shape, its first `count` frames are used in place (nothing is pickled or copied).
+    """
+    shm_name, ring_shape, count = shared_frames
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        return calibrate_camera_from_frames([ring[i] for i in range(count)], max_samples, checkerboard_sizes,
+                                            detected_checkerboard_size, square_size, objp=objp)
+    finally:
+        del ring
+        try:
+            shm.close()
+        except BufferError:
+            pass  # views still referenced by a traceback; unmapped when the process exits
+
+ # Used in caliDistortion.py (ProcessingThread runs this in a child process)
+def calibrate_camera_worker(func, args, result_queue, kwargs=None):
+    """Run func(*args, **kwargs) (one of the calibrate_camera_* functions) and put ('ok', result) or ('error', message) on result_queue."""
+    try:
+        result_queue.put(('ok', func(*args, **(kwargs or {}))))
+    except Exception as e:
+        # Traceback goes to stderr of the child process; the GUI only gets the message
+        logging.exception("Processing failed")
+        result_queue.put(('error', str(e)))
+
  # Used in caliOffset.py, caliPerspective.py, rectify_image, compute_perspective_from_samples (undistortion)
 def undistort_image(img, camera_matrix, dist_coeffs):
     """Apply camera undistortion to an image."""
@@ -92,9 +177,7 @@ def compute_perspective_from_samples(samples, max_samples, checkerboard_sizes, d
         pattern_size = detected_checkerboard_size
     else:
         pattern_size = checkerboard_sizes[0]
-    objp = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
-    objp[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2)
-    objp *= square_size
+    objp = make_object_points(pattern_size, square_size)
 
     images = samples[:max_samples]
     for img in images:
@@ -105,9 +188,7 @@ def compute_perspective_from_samples(samples, max_samples, checkerboard_sizes, d
         if found:
             if found_size != pattern_size:
                 pattern_size = found_size
-                objp = np.zeros((pattern_size[0] * pattern_size[1], 3), np.float32)
-                objp[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2)
-                objp *= square_size
+                objp = make_object_points(pattern_size, square_size)
             objpoints.append(objp)
             imgpoints.append(found_corners)
             successful_images += 1
@@ -145,18 +226,38 @@ def compute_perspective_from_samples(samples, max_samples, checkerboard_sizes, d
 
 
  # Used in calibrate_camera_from_samples, compute_perspective_from_samples, test scripts (checkerboard detection)
-def find_checkerboard_corners(img, checkerboard_sizes, detected_checkerboard_size=None):
-    """Try to find checkerboard corners in the image for all given sizes. Returns (found, size, corners)."""
+def find_checkerboard_corners(img, checkerboard_sizes, detected_checkerboard_size=None, fast=None):
+    """Try to find checkerboard corners in the image for all given sizes. Returns (found, size, corners).
+
+    With fast=True (default: FAST_DETECTION) large images are searched at half
+    resolution first and the corners are refined at full resolution.
+    """
+    if fast is None:
+        fast = FAST_DETECTION
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # Half-resolution copy for the fast path (only worth it for large images)
+    small = cv2.pyrDown(gray) if fast and min(gray.shape) >= FAST_DETECTION_MIN_SIDE else None
     sizes_to_try = list(checkerboard_sizes)
     if detected_checkerboard_size and detected_checkerboard_size in sizes_to_try:
         sizes_to_try.remove(detected_checkerboard_size)
         sizes_to_try.insert(0, detected_checkerboard_size)
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
     for size in sizes_to_try:
+        if small is not None:
+            ret, corners = cv2.findChessboardCornersSB(small, size, flags=SB_FLAGS)
+            if ret:
+                # Map back to full resolution (pyrDown samples every 2nd pixel) and refine there
+                corners = corners * 2.0
+                corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+                return True, size, corners
+        # Sector-based detector first: faster (parallel_for_ inside OpenCV) and already sub-pixel accurate
+        ret, corners = cv2.findChessboardCornersSB(gray, size, flags=SB_FLAGS)
+        if ret:
+            return True, size, corners
+        # Fallback: classic contour-based detector + cornerSubPix
         flags = cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE
         ret, corners = cv2.findChessboardCorners(gray, size, flags)
         if ret:
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
             corners2 = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
             return True, size, corners2
     return False, None, None
\ No newline at end of file